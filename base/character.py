@@ -1,9 +1,10 @@
 """Module for the Character class."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, TYPE_CHECKING, Optional
+from typing import Dict, List, TYPE_CHECKING, Optional, Tuple, Type
 
-from .talent import CharacterTalentT
+from .diminishing_returns import PERCENT_PER_POINT, points_to_percent
+from .talent import CharacterTalent, CharacterTalentT
 
 
 if TYPE_CHECKING:
@@ -12,19 +13,117 @@ if TYPE_CHECKING:
     from sim import Simulation
 
 
-class BaseCharacter(ABC):
-    """Abstract base class for all characters."""
+class StatModifier:
+    """Descriptor for a stat modifier of a character. Every change bumps the
+    character's stat epoch, so stats derived from it are recomputed."""
+
+    def __set_name__(self, owner, name):
+        self.attribute = f"_{name}_value"
+
+    def __get__(self, character, owner=None):
+        if character is None:
+            return self
+        return getattr(character, self.attribute, 0)
 
-    percent_per_point = 0.21
+    def __set__(self, character, value):
+        setattr(character, self.attribute, value)
+        character.stat_epoch += 1
+
+
+class BaseCharacter(ABC):
+    """Abstract base class for all characters.
+
+    Characters are slotted like spells. Heroes declare __slots__ for the
+    resources and spells they add.
+    """
+
+    percent_per_point = PERCENT_PER_POINT
+
+    # Percentage of each secondary stat before any stat points.
+    base_percents = {"crit": 5, "expertise": 0, "haste": 0, "spirit": 0}
+
+    # The hero's talents, and those with no effect on the simulation, such
+    # as defensives. Talent sweeps only simulate one of the builds that
+    # differ in inert talents alone.
+    talent_tree: Type[CharacterTalent] = CharacterTalent
+    inert_talents: Tuple[CharacterTalentT, ...] = ()
+
+    damage_multiplier = StatModifier()
+    main_stat_multiplier = StatModifier()
+    main_stat_additional = StatModifier()
+    crit_multiplier = StatModifier()
+    crit_additional = StatModifier()
+    expertise_multiplier = StatModifier()
+    expertise_additional = StatModifier()
+    haste_multiplier = StatModifier()
+    haste_additional = StatModifier()
+    spirit_multiplier = StatModifier()
+    spirit_additional = StatModifier()
+    crit_power_multiplier = StatModifier()
+    crit_power_additional = StatModifier()
+
+    # Stat modifiers that buffs change during a simulation.
+    modifier_attributes = (
+        "damage_multiplier",
+        "main_stat_multiplier",
+        "main_stat_additional",
+        "crit_multiplier",
+        "crit_additional",
+        "expertise_multiplier",
+        "expertise_additional",
+        "haste_multiplier",
+        "haste_additional",
+        "spirit_multiplier",
+        "spirit_additional",
+        "crit_power_multiplier",
+        "crit_power_additional",
+    )
+
+    __slots__ = (
+        "stat_epoch",
+        "_derived_epoch",
+        "_main_stat",
+        "_crit",
+        "_expertise",
+        "_haste",
+        "_spirit",
+        "_crit_power",
+        "spells",
+        "rotation",
+        "talents",
+        "talent_mask",
+        "buffs",
+        "simulation",
+        "_baseline",
+        "_derived_main_stat",
+        "_derived_crit",
+        "_derived_haste",
+        "_derived_expertise",
+        "_derived_spirit",
+        "_derived_damage_multiplier",
+        "_derived_crit_power",
+    ) + tuple(f"_{name}_value" for name in modifier_attributes)
 
     def __init__(self, main_stat, crit, expertise, haste, spirit):
+        # Bumped on every stat change. Derived stats, here and on spells,
+        # are cached along with the epoch they were computed in.
+        self.stat_epoch = 0
+        self._derived_epoch = -1
+
         # Main Stat Conversion - Points to % including DR.
         self._main_stat = main_stat
-        # Crit has a base of 5%.
-        self._crit = self.calculate_stat_diminishing_returns(crit, 5)
-        self._expertise = self.calculate_stat_diminishing_returns(expertise)
-        self._haste = self.calculate_stat_diminishing_returns(haste)
-        self._spirit = self.calculate_stat_diminishing_returns(spirit)
+        self._crit = self.calculate_stat_diminishing_returns(
+            crit, self.base_percents["crit"]
+        )
+        self._expertise = self.calculate_stat_diminishing_returns(
+            expertise, self.base_percents["expertise"]
+        )
+        self._haste = self.calculate_stat_diminishing_returns(
+            haste, self.base_percents["haste"]
+        )
+        self._spirit = self.calculate_stat_diminishing_returns(
+            spirit, self.base_percents["spirit"]
+        )
 
         self._crit_power = 1
 
@@ -34,8 +133,10 @@ class BaseCharacter(ABC):
         # This will hold the character's rotation.
         self.rotation: List[str] = []
 
-        # All the talents.
+        # All the talents, in the order learnt, and as a bitmask of
+        # their bits for has_talent.
         self.talents: List[CharacterTalentT] = []
+        self.talent_mask = 0
         # Buffs
         self.buffs: Dict[str, "BaseBuff"] = {}
         self.configure_spell_book()
@@ -57,79 +158,124 @@ class BaseCharacter(ABC):
         self.crit_power_multiplier = 0
         self.crit_power_additional = 0
 
+        # Values of the stat modifiers that reset() restores.
+        self._baseline: Dict[str, float] = {}
+
     def calculate_stat_diminishing_returns(
         self, stat_points: int, base_percent=0
     ) -> float:
         """Calculates total stat effect with diminishing returns
         applied correctly."""
+        return points_to_percent(stat_points, base_percent)
 
-        base_value = 0.21  # Base effectiveness per point (0.21%)
-        breakpoints = [10, 15, 20, 25]  # Percent thresholds
-        multipliers = [1.0, 0.9, 0.8, 0.7, 0.6]  # Multipliers for each stage
-
-        total_effect = base_percent  # Accumulated percentage
-        used_points = 0  # Points already spent
+    def add_stat_modifier(self, name: str, amount: float) -> None:
+        """Adds the amount to a stat modifier, e.g. 'haste_additional'."""
+        if name not in self.modifier_attributes:
+            raise ValueError(f"Unknown stat modifier: {name}")
 
-        for i, threshold in enumerate(
-            breakpoints + [float("inf")]
-        ):  # Include final tier
-            if used_points >= stat_points:
-                break
+        setattr(self, name, getattr(self, name) + amount)
 
-            # Remaining percentage needed to reach the next threshold
-            required_percentage = threshold - total_effect
-            points_to_threshold = (
-                required_percentage / base_value
-            )  # Convert % to points
+    def invalidate_stats(self) -> None:
+        """Marks the derived stats as stale after a base stat changed."""
+        self.stat_epoch += 1
 
-            # Points available in this tier
-            points_used = min(stat_points - used_points, points_to_threshold)
-
-            # Apply the appropriate multiplier for this tier
-            total_effect += points_used * base_value * multipliers[i]
-            used_points += points_used  # Update total points used
-
-        return total_effect
+    def _update_derived_stats(self) -> None:
+        """Recomputes every derived stat for the current epoch."""
+        self._derived_main_stat = (
+            self._main_stat + self.main_stat_additional
+        ) * (1 + self.main_stat_multiplier)
+        self._derived_crit = (self._crit + self.crit_additional) * (
+            1 + self.crit_multiplier
+        )
+        self._derived_haste = (self._haste + self.haste_additional) * (
+            1 + self.haste_multiplier
+        )
+        self._derived_expertise = (
+            self._expertise + self.expertise_additional
+        ) * (1 + self.expertise_multiplier)
+        self._derived_spirit = (self._spirit + self.spirit_additional) * (
+            1 + self.spirit_multiplier
+        )
+        self._derived_damage_multiplier = 1 + self.damage_multiplier
+        self._derived_crit_power = (
+            self._crit_power + self.crit_power_additional
+        ) * (1 + self.crit_multiplier)
+        self._derived_epoch = self.stat_epoch
 
     def set_simulation(self, simulation: "Simulation") -> None:
         """Sets the simulation for the character."""
         self.simulation = simulation
 
+    def capture_baseline(self) -> None:
+        """Captures the current stat modifiers as the state reset()
+        returns to."""
+        self._baseline = {
+            name: getattr(self, name) for name in self.modifier_attributes
+        }
+
+    def reset(self) -> None:
+        """Resets the character, its spells and its buffs back to the
+        captured baseline so it can be simulated again."""
+        for name, value in self._baseline.items():
+            setattr(self, name, value)
+
+        self.buffs.clear()
+        for spell in self.spells.values():
+            spell.reset()
+
     def get_main_stat(self) -> float:
         """Returns the character's main stat."""
-        return (self._main_stat + self.main_stat_additional) * (
-            1 + self.main_stat_multiplier
-        )
+        if self._derived_epoch != self.stat_epoch:
+            self._update_derived_stats()
+        return self._derived_main_stat
 
     def get_crit(self) -> float:
         """Returns the character's crit as a percentage."""
-        return (self._crit + self.crit_additional) * (1 + self.crit_multiplier)
+        if self._derived_epoch != self.stat_epoch:
+            self._update_derived_stats()
+        return self._derived_crit
 
     def get_haste(self) -> float:
         """Returns the character's haste as a percentage."""
-        return (self._haste + self.haste_additional) * (
-            1 + self.haste_multiplier
-        )
+        if self._derived_epoch != self.stat_epoch:
+            self._update_derived_stats()
+        return self._derived_haste
 
     def get_expertise(self) -> float:
         """Returns the character's expertise as a percentage."""
-        return (self._expertise + self.expertise_additional) * (
-            1 + self.expertise_multiplier
-        )
+        if self._derived_epoch != self.stat_epoch:
+            self._update_derived_stats()
+        return self._derived_expertise
 
     def get_spirit(self) -> float:
         """Returns the character's spirit as a percentage."""
-        return (self._spirit + self.spirit_additional) * (
-            1 + self.spirit_multiplier
-        )
+        if self._derived_epoch != self.stat_epoch:
+            self._update_derived_stats()
+        return self._derived_spirit
 
     def get_damage_multiplier(self) -> float:
         """Returns the character's damage multiplyer."""
-        return 1 + self.damage_multiplier
+        if self._derived_epoch != self.stat_epoch:
+            self._update_derived_stats()
+        return self._derived_damage_multiplier
+
+    def learn_talent(self, talent: CharacterTalentT) -> None:
+        """Adds the talent to the character's talents."""
+        if not self.talent_mask & talent.bit:
+            self.talents.append(talent)
+            self.talent_mask |= talent.bit
 
     def has_talent(self, talent: CharacterTalentT) -> bool:
         """Returns true if the talent is present."""
-        return talent in self.talents
+        return bool(self.talent_mask & talent.bit)
+
+    @property
+    def simulated_talent_mask(self) -> int:
+        """Returns the talent mask without the inert talents."""
+        mask = self.talent_mask
+        for talent in self.inert_talents:
+            mask &= ~talent.bit
+        return mask
 
     def has_buff(self, buff_simfell_name: str) -> bool:
         """Returns true if the buff is present"""
@@ -144,9 +290,9 @@ class BaseCharacter(ABC):
 
     def get_crit_power(self) -> float:
         """Returns crit power."""
-        return (self._crit_power + self.crit_power_additional) * (
-            1 + self.crit_multiplier
-        )
+        if self._derived_epoch != self.stat_epoch:
+            self._update_derived_stats()
+        return self._derived_crit_power
 
     @abstractmethod
     def configure_spell_book(self) -> None:
@@ -0,0 +1,31 @@
+"""Module for the simulation's time base.
+
+Simulations keep time as whole milliseconds, so timestamps compare and add
+exactly. Spell data and everything shown to users stays in seconds.
+"""
+
+import math
+
+MILLISECONDS_PER_SECOND = 1000
+
+
+def to_ms(seconds: float) -> int:
+    """Returns the seconds as whole milliseconds. Infinite durations stay
+    infinite."""
+    if seconds == math.inf:
+        return seconds
+    return round(seconds * MILLISECONDS_PER_SECOND)
+
+
+def to_seconds(milliseconds: float) -> float:
+    """Returns the milliseconds as seconds."""
+    return milliseconds / MILLISECONDS_PER_SECOND
+
+
+def ticks_due(first_tick_ms: float, tick_rate_ms: int, end_ms: int) -> int:
+    """Returns how many ticks at first_tick_ms + k * tick_rate_ms, k >= 0,
+    fall at or before the end. The first tick is infinite for auras that
+    never tick."""
+    if first_tick_ms > end_ms:
+        return 0
+    return (end_ms - first_tick_ms) // tick_rate_ms + 1
@@ -0,0 +1,71 @@
+"""Module for converting stat points to percentages with diminishing
+returns."""
+
+from functools import lru_cache
+from typing import Tuple, Union
+
+import numpy as np
+
+# Percent per stat point before diminishing returns.
+PERCENT_PER_POINT = 0.21
+
+# Percent thresholds where each point starts being worth less, and the
+# multiplier of the points before the first threshold, between each pair of
+# thresholds, and past the last one.
+BREAKPOINTS = (10, 15, 20, 25)
+MULTIPLIERS = (1.0, 0.9, 0.8, 0.7, 0.6)
+
+ArrayLike = Union[float, np.ndarray]
+
+
+@lru_cache(maxsize=None)
+def _knots(base_percent: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the points and percentages where the slope changes, starting
+    at zero points.
+
+    Each stage spans the points that would reach its threshold at full
+    value, so the percentage stays just short of each threshold, as in the
+    game's stat sheet. Thresholds the base is already past are skipped.
+    """
+    points = [0.0]
+    percents = [float(base_percent)]
+    for threshold, multiplier in zip(BREAKPOINTS, MULTIPLIERS):
+        if threshold <= percents[-1]:
+            continue
+        stage_points = (threshold - percents[-1]) / PERCENT_PER_POINT
+        points.append(points[-1] + stage_points)
+        percents.append(
+            percents[-1] + stage_points * PERCENT_PER_POINT * multiplier
+        )
+
+    return np.array(points), np.array(percents)
+
+
+def points_to_percent(
+    stat_points: ArrayLike, base_percent: float = 0
+) -> ArrayLike:
+    """Returns the percentage of the stat points, with diminishing returns,
+    on top of the base. Works on scalars and arrays of points."""
+    points, percents = _knots(base_percent)
+    stat_points = np.maximum(np.asarray(stat_points, dtype=float), 0)
+
+    past_last = np.maximum(stat_points - points[-1], 0)
+    result = np.interp(stat_points, points, percents) + past_last * (
+        PERCENT_PER_POINT * MULTIPLIERS[-1]
+    )
+    return result if result.ndim else float(result)
+
+
+def percent_to_points(
+    percent: ArrayLike, base_percent: float = 0
+) -> ArrayLike:
+    """Returns the stat points needed to reach the percentage, the inverse of
+    points_to_percent. Percentages up to the base need no points."""
+    points, percents = _knots(base_percent)
+    percent = np.asarray(percent, dtype=float)
+
+    past_last = np.maximum(percent - percents[-1], 0)
+    result = np.interp(percent, percents, points) + past_last / (
+        PERCENT_PER_POINT * MULTIPLIERS[-1]
+    )
+    return result if result.ndim else float(result)
@@ -0,0 +1,71 @@
+"""Module for the per-simulation random number streams."""
+
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Rolls generated per refill. Large blocks keep NumPy's per-call overhead
+# negligible while staying small enough to not matter for memory.
+BLOCK_SIZE = 4096
+
+
+class RandomStream:
+    """Class for a stream of rolls between 0 and 100, generated in blocks."""
+
+    __slots__ = ("_generator", "_block", "_cursor")
+
+    def __init__(self, seed_sequence: np.random.SeedSequence):
+        self._generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        self._block: List[float] = []
+        self._cursor = 0
+
+    def roll(self) -> float:
+        """Returns the next roll, uniform between 0 and 100."""
+        if self._cursor == len(self._block):
+            self._block = (self._generator.random(BLOCK_SIZE) * 100).tolist()
+            self._cursor = 0
+
+        value = self._block[self._cursor]
+        self._cursor += 1
+        return value
+
+
+class SimulationRandom:
+    """Class for the random source of a single simulation.
+
+    Every roll category (crit, spirit, procs...) gets its own stream, derived
+    from the seed and the category name. Adding rolls to one category never
+    shifts the numbers another category sees.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed
+        self._seed_sequence = np.random.SeedSequence(seed)
+        self._streams: Dict[str, RandomStream] = {}
+
+    def reseed(self, seed: Optional[int] = None) -> None:
+        """Restarts every stream from a new seed."""
+        self.seed = seed
+        self._seed_sequence = np.random.SeedSequence(seed)
+        self._streams.clear()
+
+    def stream(self, category: str) -> RandomStream:
+        """Returns the stream for the roll category."""
+        stream = self._streams.get(category)
+        if stream is None:
+            stream = RandomStream(
+                np.random.SeedSequence(
+                    self._seed_sequence.entropy,
+                    spawn_key=(zlib.crc32(category.encode()),),
+                )
+            )
+            self._streams[category] = stream
+        return stream
+
+    def roll(self, category: str) -> float:
+        """Returns the next roll of the category, between 0 and 100."""
+        stream = self._streams.get(category)
+        if stream is None:
+            stream = self.stream(category)
+        return stream.roll()
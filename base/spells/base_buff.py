@@ -1,25 +1,66 @@
 """Base class for all buffs."""
 
-from rich import print  # pylint: disable=redefined-builtin
-
 from base import BaseSpell
+from base.clock import ticks_due, to_ms, to_seconds
+from event_log import AuraEvent
 from base.character import BaseCharacter
 
 
 class BaseBuff(BaseSpell):
     """Abstract base class for all buffs."""
 
-    remaining_time = 0
+    __slots__ = (
+        "duration",
+        "tick_rate_ms",
+        "maximum_stacks",
+        "current_stacks",
+        "next_tick_ms",
+        "expiration_ms",
+        "last_update_ms",
+        "_timer_event",
+        "_is_active",
+    )
 
     def __init__(self, *args, duration=0, maximum_stacks=1, **kwargs):
         super().__init__(*args, **kwargs)
         self.duration = duration
-        self.tick_rate = 0
-        self.time_to_next_tick = 0
+        self.tick_rate_ms = 0
         self.maximum_stacks = maximum_stacks
         self.current_stacks = 0
 
-        self._is_active = True
+        # Absolute times of the next tick and of the expiry, in
+        # milliseconds.
+        self.next_tick_ms = float("inf")
+        self.expiration_ms = 0
+        self.last_update_ms = 0
+        self._timer_event = None
+
+        self._is_active = False
+
+    def reset(self) -> None:
+        """Resets the buff to its inactive state."""
+        super().reset()
+        self.tick_rate_ms = 0
+        self.current_stacks = 0
+        self.next_tick_ms = float("inf")
+        self.expiration_ms = 0
+        self.last_update_ms = 0
+        self._timer_event = None
+        self._is_active = False
+
+    @property
+    def remaining_time(self) -> float:
+        """Returns the remaining duration of the buff."""
+        if not self._is_active:
+            return 0
+        return to_seconds(
+            self.expiration_ms - self.character.simulation.now_ms
+        )
+
+    @property
+    def time_to_next_tick(self) -> float:
+        """Returns the time left until the next tick of the buff."""
+        return to_seconds(self.next_tick_ms - self.character.simulation.now_ms)
 
     def cast(self, do_damage=False):
         super().cast(do_damage)
@@ -32,26 +73,25 @@ class BaseBuff(BaseSpell):
             self.character.buffs[self.simfell_id].reapply()
             return
 
-        if self.base_tick_duration > 0:
-            self.tick_rate = self.base_tick_duration / (
-                1 + (self.character.get_haste() / 100)
-            )
-
-            self.time_to_next_tick = self.tick_rate
-        else:
-            self.time_to_next_tick = self.duration
-
-        self.remaining_time = self.duration
+        self._start_timers()
         self.character.buffs[self.simfell_id] = self
         self.on_apply()
 
         self._is_active = True
 
-        if self.character.simulation.do_debug:
-            print(
-                f"Time {self.character.simulation.time:.2f}: "
-                + f"✔️ Applied [dark_green]{self.name} "
-                + "(Buff)[/dark_green] to character."
+        timeline = self.character.simulation.timeline
+        if timeline is not None:
+            timeline.aura_started(self.name, self.character.simulation.time)
+
+        event_log = self.character.simulation.event_log
+        if event_log is not None:
+            event_log.record(
+                AuraEvent(
+                    self.character.simulation.time,
+                    "apply",
+                    self.name,
+                    is_debuff=False,
+                )
             )
 
     def on_apply(self) -> None:
@@ -62,43 +102,100 @@ class BaseBuff(BaseSpell):
         if self.current_stacks < self.maximum_stacks:
             self.current_stacks += 1
 
-        if self.base_tick_duration > 0:
-            self.tick_rate = self.base_tick_duration / (
-                1 + (self.character.get_haste() / 100)
+        self._start_timers()
+        self.character.buffs[self.simfell_id] = self
+
+        self._is_active = True
+
+        event_log = self.character.simulation.event_log
+        if event_log is not None:
+            event_log.record(
+                AuraEvent(
+                    self.character.simulation.time,
+                    "reapply",
+                    self.name,
+                    is_debuff=False,
+                )
             )
 
-            self.time_to_next_tick = self.tick_rate
-        else:
-            self.time_to_next_tick = self.duration
+    def _start_timers(self) -> None:
+        """Starts the tick and expiry timers from the current time."""
+        now_ms = self.character.simulation.now_ms
 
-        self.remaining_time = self.duration
-        self.character.buffs[self.simfell_id] = self
+        if self.base_tick_duration > 0:
+            self.tick_rate_ms = max(
+                to_ms(
+                    self.base_tick_duration
+                    / (1 + (self.character.get_haste() / 100))
+                ),
+                1,
+            )
 
-        self._is_active = True
+            self.next_tick_ms = now_ms + self.tick_rate_ms
+        else:
+            self.next_tick_ms = float("inf")
+
+        self.expiration_ms = now_ms + to_ms(self.duration)
+        self.last_update_ms = now_ms
+        self._schedule_timer()
+
+    def _schedule_timer(self) -> None:
+        """Schedules the next tick or expiry, whichever comes first."""
+        if self._timer_event is not None:
+            self._timer_event.cancel()
+            self._timer_event = None
+
+        next_time = min(self.next_tick_ms, self.expiration_ms)
+        if next_time != float("inf"):
+            self._timer_event = self.character.simulation.schedule(
+                next_time, self._on_timer
+            )
 
-        if self.character.simulation.do_debug:
-            print(
-                f"Time {self.character.simulation.time:.2f}: "
-                + f"🔄 Re-Applied [dark_green]{self.name} "
-                + "(Buff)[/dark_green] to character."
+    def _on_timer(self) -> None:
+        """Called by the simulation when a tick or the expiry is due."""
+        self._timer_event = None
+
+        event_log = self.character.simulation.event_log
+        if event_log is not None:
+            event_log.record(
+                AuraEvent(
+                    self.character.simulation.time,
+                    "update",
+                    self.name,
+                    is_debuff=False,
+                )
             )
 
+        self._update_until(self.character.simulation.now_ms)
+
     def update_remaining_duration(self, delta_time: float) -> None:
         """Decreases the remaining buff duration by the delta time."""
 
         if self._is_active:
-            while delta_time > 0 and self.remaining_time > 0:
-                if delta_time >= self.time_to_next_tick:
-                    self.remaining_time -= self.time_to_next_tick
-                    self.time_to_next_tick = self.tick_rate
-                    self.on_tick()
-                else:
-                    self.time_to_next_tick -= delta_time
-                    self.remaining_time -= delta_time
-                    delta_time = 0
-
-            if self.remaining_time <= 0 and self._is_active:
-                self.remove()
+            self._update_until(self.last_update_ms + to_ms(delta_time))
+
+    def _update_until(self, end_ms: int) -> None:
+        """Fires every tick due up to the end time and removes the buff
+        if it has expired by then. The ticks due are counted from the tick
+        rate, so only real ticks cost anything."""
+        self.last_update_ms = end_ms
+
+        first_tick = self.next_tick_ms
+        due = ticks_due(
+            first_tick, self.tick_rate_ms, min(end_ms, self.expiration_ms)
+        )
+        for tick in range(1, due + 1):
+            next_tick_ms = first_tick + tick * self.tick_rate_ms
+            self.next_tick_ms = next_tick_ms
+            self.on_tick()
+            # Stop if the tick removed or restarted the aura.
+            if not self._is_active or self.next_tick_ms != next_tick_ms:
+                break
+
+        if self.expiration_ms <= end_ms and self._is_active:
+            self.remove()
+        elif self._is_active:
+            self._schedule_timer()
 
     def remove(self, remove_all_stacks=True) -> None:
         """Removes the buff from the character."""
@@ -108,15 +205,25 @@ class BaseBuff(BaseSpell):
             self.current_stacks -= 1
 
         if self.current_stacks == 0:
-            self.remaining_time = 0
+            if self._timer_event is not None:
+                self._timer_event.cancel()
+                self._timer_event = None
             self.character.buffs.pop(self.simfell_id, None)
             self.on_remove()
             self._is_active = False
-            if self.character.simulation.do_debug:
-                print(
-                    f"Time {self.character.simulation.time:.2f}: "
-                    + f"❌ Removed [dark_green]{self.name} "
-                    + "(Buff)[/dark_green] from character."
+
+            timeline = self.character.simulation.timeline
+            if timeline is not None:
+                timeline.aura_ended(self.name, self.character.simulation.time)
+            event_log = self.character.simulation.event_log
+            if event_log is not None:
+                event_log.record(
+                    AuraEvent(
+                        self.character.simulation.time,
+                        "remove",
+                        self.name,
+                        is_debuff=False,
+                    )
                 )
 
     def on_remove(self):
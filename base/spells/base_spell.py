@@ -1,16 +1,72 @@
 """Module for the Spell class."""
 
-import random
-from abc import ABC
-from typing import TYPE_CHECKING, final
-from rich import print  # pylint: disable=redefined-builtin
+import sys
+from abc import ABCMeta
+from typing import TYPE_CHECKING, Dict, final
+
+from base.clock import to_ms, to_seconds
+from event_log import DamageEvent
 
 if TYPE_CHECKING:
     from base.character import BaseCharacter
+    from base.talent import CharacterTalentT
+
+
+class SpellMeta(ABCMeta):
+    """Metaclass of spells. Merges the talent flags of a spell class with its
+    parents' and adds the new ones to the class's slots."""
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        inherited: Dict[str, "CharacterTalentT"] = {}
+        for base in reversed(bases):
+            inherited.update(getattr(base, "talent_flags", {}))
+
+        own = namespace.get("talent_flags", {})
+        if "__slots__" in namespace:
+            namespace["__slots__"] = tuple(namespace["__slots__"]) + tuple(
+                flag for flag in own if flag not in inherited
+            )
+        namespace["talent_flags"] = {**inherited, **own}
 
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
 
-class BaseSpell(ABC):
-    """Abstract base class for all spells."""
+
+class BaseSpell(metaclass=SpellMeta):
+    """Abstract base class for all spells.
+
+    Spells are slotted to keep them small and their attributes fast, as
+    every simulation holds its own copy of the spell book. Subclasses
+    declare __slots__ for the attributes they add, or () if none.
+    """
+
+    __slots__ = (
+        "name",
+        "simfell_id",
+        "cast_time",
+        "cooldown",
+        "damage_percent",
+        "channeled",
+        "base_tick_duration",
+        "has_gcd",
+        "can_cast_on_gcd",
+        "can_cast_while_casting",
+        "cooldown_ready_ms",
+        "_cooldown_event",
+        "character",
+        "buff",
+        "debuff",
+        "ticks",
+        "_haste_epoch",
+        "_gcd",
+        "_hasted_cast_time",
+        "counter_slot",
+    )
+
+    # Talent flags of the spell, as attribute name to talent. The attributes
+    # are set to whether the character has the talent on every reset, so
+    # hot paths read a boolean instead of checking the talents. Subclasses
+    # add to the flags of their parents.
+    talent_flags: Dict[str, "CharacterTalentT"] = {}
 
     def __init__(
         self,
@@ -30,6 +86,9 @@ class BaseSpell(ABC):
         debuff=None,
     ):
         self.name = name
+        # Name of the spell in the simfell file, also the key of its buff or
+        # debuff while active.
+        self.simfell_id = sys.intern(name.lower().replace(" ", "_"))
         self.cast_time = cast_time
         self.cooldown = cooldown
         self.damage_percent = damage_percent
@@ -38,11 +97,21 @@ class BaseSpell(ABC):
         self.has_gcd = has_gcd
         self.can_cast_on_gcd = can_cast_on_gcd
         self.can_cast_while_casting = can_cast_while_casting
-        self.remaining_cooldown = 0
+        # Absolute time in milliseconds the spell comes off cooldown.
+        self.cooldown_ready_ms = 0
+        self._cooldown_event = None
         self.character = None
         self.buff = buff
         self.debuff = debuff
         self.ticks = 0
+        # GCD and hasted cast time, cached for the character's stat epoch.
+        self._haste_epoch = -1
+        self._gcd = 0
+        self._hasted_cast_time = 0
+        # Slot of the spell in its simulation's counters, set on first use.
+        self.counter_slot = None
+        for flag in self.talent_flags:
+            setattr(self, flag, False)
 
     @final
     def set_character(self, character: "BaseCharacter") -> None:
@@ -50,18 +119,22 @@ class BaseSpell(ABC):
         self.character = character
 
     @property
-    def simfell_id(self) -> str:
-        """Returns the name of the spell in the simfell file."""
-        return self.name.lower().replace(" ", "_")
+    def remaining_cooldown(self) -> float:
+        """Returns the time left until the spell comes off cooldown."""
+        return to_seconds(
+            max(self.cooldown_ready_ms - self.character.simulation.now_ms, 0)
+        )
 
     def is_ready(self) -> bool:
         """Returns True if the spell is ready to be cast."""
-        return self.remaining_cooldown <= 0
+        return self.cooldown_ready_ms <= self.character.simulation.now_ms
 
     def effective_cast_time(self) -> float:
         """Returns the effective cast time of the spell.
         Including any modifiers."""
-        return self.cast_time * (1 - self.character.get_haste() / 100)
+        if self._haste_epoch != self.character.stat_epoch:
+            self._update_hasted_times()
+        return self._hasted_cast_time
 
     def cast(self, do_damage=True) -> None:
         """Casts the spell."""
@@ -86,13 +159,20 @@ class BaseSpell(ABC):
     # so this will future support that.
     def get_gcd(self) -> float:
         """Returns the GCD of the spell."""
-        return (
-            1.5 / (1 + self.character.get_haste() / 100) if self.has_gcd else 0
-        )
+        if self._haste_epoch != self.character.stat_epoch:
+            self._update_hasted_times()
+        return self._gcd
+
+    def _update_hasted_times(self) -> None:
+        """Recomputes the GCD and cast time for the current stat epoch."""
+        haste = self.character.get_haste()
+        self._gcd = 1.5 / (1 + haste / 100) if self.has_gcd else 0
+        self._hasted_cast_time = self.cast_time * (1 - haste / 100)
+        self._haste_epoch = self.character.stat_epoch
 
     def damage(self) -> float:
-        """Returns the damage of the spell. Including any modifiers."""
-        # TODO: Handle AOE.
+        """Deals the damage of the spell, including any modifiers, to the
+        primary target and returns it."""
         damage = self.damage_percent  # The base damage of the spell.
         damage = self.damage_modifiers(
             damage  # Damage modifiers that modify the base %.
@@ -100,22 +180,62 @@ class BaseSpell(ABC):
         damage = self.damage_modified_player_stats(
             damage  # The damage after being modified by player stats.
         )
-        damage *= 1 + self.character.damage_multiplier
+        damage *= self.character.get_damage_multiplier()
 
         # Roll for Crit Damage.
-        if random.uniform(0, 100) < self.get_crit_chance():
-            self.on_crit()
+        is_crit = (
+            self.character.simulation.random.roll("crit")
+            < self.get_crit_chance()
+        )
+        if is_crit:
             damage *= 2 * self.character.get_crit_power()
+            self.on_crit()
+
+        self.record_damage(self.name, damage, 1, int(is_crit))
+        return damage
+
+    def cleave(self, damage: float, maximum_targets: int, name: str) -> float:
+        """Deals the damage to up to the maximum enemies besides the primary
+        target, recorded under the given name. Returns the total."""
+        targets = min(
+            maximum_targets, self.character.simulation.enemy_count - 1
+        )
+        if targets <= 0:
+            return 0
+
+        damage *= targets
+        self.record_damage(name, damage, targets, 0)
+        return damage
+
+    @final
+    def record_damage(
+        self, name: str, damage: float, hits: int, crits: int
+    ) -> None:
+        """Adds dealt damage to the simulation's total, counters, timeline
+        and event log."""
+        simulation = self.character.simulation
 
         if damage > 0:
-            if self.character.simulation.do_debug:
-                print(
-                    f"Time {self.character.simulation.time:.2f}: "
-                    + f"💥 [cornflower_blue]{self.name}[/cornflower_blue] "
-                    + f"deals [bold red]{damage:.2f}[/bold red] damage"
+            counters = simulation.spell_counters
+            if name == self.name:
+                slot = self.counter_slot
+                if slot is None:
+                    slot = self.counter_slot = counters.slot(name)
+            else:
+                slot = counters.slot(name)
+            counters.damage[slot] += damage
+            counters.hits[slot] += hits
+            counters.crits[slot] += crits
+
+            if simulation.timeline is not None:
+                simulation.timeline.add_damage(simulation.time, damage)
+
+            if simulation.event_log is not None:
+                simulation.event_log.record(
+                    DamageEvent(simulation.time, name, damage, crits > 0, hits)
                 )
 
-        self.character.simulation.damage += damage
+        simulation.damage += damage
 
     # Used as an override for damage modifiers from Talents and other sources.
     def damage_modifiers(self, damage) -> float:
@@ -159,15 +279,62 @@ class BaseSpell(ABC):
 
     def set_cooldown(self) -> None:
         """Sets the cooldown of the spell."""
-        self.remaining_cooldown = self.cooldown
+        self.cooldown_ready_ms = self.character.simulation.now_ms + to_ms(
+            self.cooldown
+        )
+        if self.cooldown > 0 or self._cooldown_event is not None:
+            self._schedule_cooldown_ready()
 
     def reset_cooldown(self) -> None:
         """Resets the cooldown of the spell."""
-        self.remaining_cooldown = 0
+        self.cooldown_ready_ms = self.character.simulation.now_ms
+        self._schedule_cooldown_ready()
+
+    def update_cooldown(self, delta_time: float) -> None:
+        """Decreases the remaining cooldown by the delta time in seconds."""
+        if self._cooldown_event is not None:
+            self.cooldown_ready_ms -= to_ms(delta_time)
+            self._schedule_cooldown_ready()
+
+    def _schedule_cooldown_ready(self) -> None:
+        """(Re)schedules the event that wakes the simulation up when the
+        spell comes off cooldown."""
+        if self._cooldown_event is not None:
+            self._cooldown_event.cancel()
+            self._cooldown_event = None
+
+        simulation = self.character.simulation
+        if self.cooldown_ready_ms > simulation.now_ms:
+            self._cooldown_event = simulation.schedule(
+                self.cooldown_ready_ms, self._on_cooldown_ready
+            )
+
+    def _on_cooldown_ready(self) -> None:
+        """Called when the spell comes off cooldown."""
+        self._cooldown_event = None
+
+    def reset(self) -> None:
+        """Resets the spell and its buff and debuff to their state before
+        the first cast."""
+        self.cooldown_ready_ms = 0
+        self._cooldown_event = None
+        self.ticks = 0
+
+        # The buff and debuff only get the character once applied, so they
+        # take their flags from the spell's.
+        if self.buff is not None:
+            self.buff.reset()
+        if self.debuff is not None:
+            self.debuff.reset()
+        if self.character is not None:
+            for spell in (self, self.buff, self.debuff):
+                if spell is not None:
+                    spell.resolve_talent_flags(self.character)
 
-    def update_cooldown(self, delta_time: int) -> None:
-        """Decreases the remaining cooldown by the delta time."""
-        self.remaining_cooldown -= delta_time
+    def resolve_talent_flags(self, character: "BaseCharacter") -> None:
+        """Sets the spell's talent flags from the character's talents."""
+        for name, talent in self.talent_flags.items():
+            setattr(self, name, character.has_talent(talent))
 
     def apply_buff(self):
         """Applies the associated buff to the character."""
@@ -1,6 +1,7 @@
 """Module for Talents"""
 
-from typing import TypeVar, Optional, Type
+from itertools import combinations, product
+from typing import Dict, List, TypeVar, Optional, Type
 from dataclasses import dataclass
 from enum import Enum
 
@@ -20,13 +21,45 @@ class CharacterTalent(Enum):
 
     # value: Talent
 
+    def __init__(self, *args):
+        # Bit of the talent in a character's talent mask, by its ordinal.
+        self.bit = 1 << len(type(self)._member_names_)
+
     @classmethod
     def get_by_identifier(
         cls: Type["CharacterTalent"], identifier: str
     ) -> Optional["CharacterTalent"]:
         """Get a talent by its identifier."""
 
+        by_identifier = cls.__dict__.get("_by_identifier")
+        if by_identifier is None:
+            by_identifier = {talent.value.identifier: talent for talent in cls}
+            cls._by_identifier = by_identifier
+        return by_identifier.get(identifier)
+
+    @classmethod
+    def rows(cls: Type["CharacterTalent"]) -> Dict[int, List[int]]:
+        """Returns the columns of each row of the talent tree, from the
+        'row.column' identifiers."""
+        rows: Dict[int, List[int]] = {}
         for talent in cls:
-            if talent.value.identifier == identifier:
-                return talent
-        return None
+            row, column = talent.value.identifier.split(".")
+            rows.setdefault(int(row), []).append(int(column))
+        return {row: sorted(columns) for row, columns in sorted(rows.items())}
+
+    @classmethod
+    def builds(
+        cls: Type["CharacterTalent"], picks_per_row: int = 1
+    ) -> List[str]:
+        """Returns the talent string of every build picking the given number
+        of talents in each row, e.g. '2-13-3'. Rows without picks are '0'."""
+        row_picks = [
+            [
+                "".join(str(column) for column in pick) or "0"
+                for pick in combinations(
+                    columns, min(picks_per_row, len(columns))
+                )
+            ]
+            for columns in cls.rows().values()
+        ]
+        return ["-".join(build) for build in product(*row_picks)]
@@ -0,0 +1,236 @@
+"""Throughput benchmarks for the simulation engine."""
+
+import argparse
+import itertools
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from simfell_parser.model import Action, SimFellConfiguration
+from simfell_parser.simfile_parser import SimFileParser
+from simfell_parser.utils import default_simfell_files
+from sim import Simulation
+
+DEFAULT_DURATIONS = [30, 120, 300, 600]
+DEFAULT_ENEMIES = [1, 3, 8]
+DEFAULT_TALENTS = ["0-0-0", "2-12-3", "123-123-123"]
+
+# Action lists benchmarked per hero. "plain" is the default SimFell file's
+# list, "conditions" exercises the condition evaluator on every decision.
+CONDITION_ACTIONS: Dict[str, List[Action]] = {
+    "Rime": [
+        Action(name="/wrath_of_winter"),
+        Action(name="/ice_blitz"),
+        Action(
+            name="/dance_of_swallows",
+            condition="spell.cold_snap.remaining_cooldown < 2",
+        ),
+        Action(
+            name="/cold_snap",
+            condition="debuff.dance_of_swallows.remaining_time > 0 "
+            + "and character.anima < 5 and character.winter_orbs < 4",
+        ),
+        Action(
+            name="/bursting_ice",
+            condition="active_enemies > 2 or character.winter_orbs >= 0",
+        ),
+        Action(
+            name="/freezing_torrent",
+            condition="not buff.ice_blitz.remaining_time > 100",
+        ),
+        Action(name="/glacial_blast", condition="character.winter_orbs > 1"),
+        Action(name="/frost_bolt"),
+    ],
+}
+
+# Iterations run while tracing allocations. Tracing is slow, and the peak
+# is reached within the first few runs.
+MEMORY_ITERATIONS = 3
+
+
+def build_configuration(
+    base: SimFellConfiguration,
+    duration: int,
+    enemies: int,
+    talents: str,
+    apl: str,
+) -> SimFellConfiguration:
+    """Returns the configuration of a benchmark case."""
+    changes = {"duration": duration, "enemies": enemies, "talents": talents}
+    if apl == "conditions":
+        changes["actions"] = CONDITION_ACTIONS[base.hero]
+
+    return base.with_changes(**changes)
+
+
+def measure(
+    configuration: SimFellConfiguration, min_time: float, seed: int
+) -> Dict[str, float]:
+    """Runs the configuration for at least the given wall time and returns
+    its throughput and peak memory."""
+    simulation = Simulation(configuration, seed=seed)
+    simulation.run()  # Warm up.
+
+    iterations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        simulation.run()
+        iterations += 1
+        elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    simulation = Simulation(configuration, seed=seed)
+    for _ in range(MEMORY_ITERATIONS):
+        simulation.run()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "seconds": elapsed,
+        "iterations_per_second": iterations / elapsed,
+        "seconds_per_simulated_second": (
+            elapsed / (iterations * configuration.duration)
+        ),
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def main(arguments: argparse.Namespace) -> None:
+    """Runs every benchmark case and writes the results."""
+    base = SimFileParser(default_simfell_files[arguments.hero]).parse()
+    cases = list(
+        itertools.product(
+            arguments.durations,
+            arguments.enemies,
+            arguments.talents,
+            arguments.apls,
+        )
+    )
+
+    console = Console()
+    table = Table(title="Engine Benchmarks", box=box.SIMPLE)
+    for column in ("Duration", "Enemies", "Talents", "APL"):
+        table.add_column(column, style="blue", justify="center")
+    for column in ("Iterations/s", "µs/Sim Second", "Peak Memory"):
+        table.add_column(column, style="yellow", justify="right")
+
+    results = []
+    for index, (duration, enemies, talents, apl) in enumerate(cases):
+        console.print(
+            f"[grey37]({index + 1}/{len(cases)}) {duration}s, "
+            + f"{enemies} enemies, {talents}, {apl}"
+        )
+        configuration = build_configuration(
+            base, duration, enemies, talents, apl
+        )
+        result = {
+            "duration": duration,
+            "enemies": enemies,
+            "talents": talents,
+            "apl": apl,
+            **measure(configuration, arguments.min_time, arguments.seed),
+        }
+        results.append(result)
+
+        table.add_row(
+            str(duration),
+            str(enemies),
+            talents,
+            apl,
+            f"{result['iterations_per_second']:.1f}",
+            f"{result['seconds_per_simulated_second'] * 1e6:.1f}",
+            f"{result['peak_memory_bytes'] / 1024:.0f} KiB",
+        )
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "hero": arguments.hero,
+        "min_time": arguments.min_time,
+        "results": results,
+    }
+    with open(arguments.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+    console.print(table)
+    console.print(f"Results written to {arguments.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the simulation engine."
+    )
+    parser.add_argument(
+        "-ch",
+        "--hero",
+        type=str,
+        default="Rime",
+        choices=CONDITION_ACTIONS.keys(),
+        help="Hero to benchmark, using its default SimFell file.",
+    )
+    parser.add_argument(
+        "-d",
+        "--durations",
+        type=int,
+        nargs="+",
+        default=DEFAULT_DURATIONS,
+        help="Fight durations in seconds.",
+    )
+    parser.add_argument(
+        "-e",
+        "--enemies",
+        type=int,
+        nargs="+",
+        default=DEFAULT_ENEMIES,
+        help="Enemy counts.",
+    )
+    parser.add_argument(
+        "-t",
+        "--talents",
+        type=str,
+        nargs="+",
+        default=DEFAULT_TALENTS,
+        help="Talent strings.",
+    )
+    parser.add_argument(
+        "-a",
+        "--apls",
+        type=str,
+        nargs="+",
+        default=["plain", "conditions"],
+        choices=["plain", "conditions"],
+        help="Action lists, without and with conditions.",
+    )
+    parser.add_argument(
+        "-m",
+        "--min-time",
+        type=float,
+        default=1.0,
+        help="Minimum wall time in seconds to run each case for.",
+    )
+    parser.add_argument(
+        "-s",
+        "--seed",
+        type=int,
+        default=1,
+        help="Seed of the simulations, so runs are comparable.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default="benchmark_results.json",
+        help="JSON file to write the results to.",
+    )
+
+    main(parser.parse_args())
@@ -7,6 +7,8 @@ from characters._example.examplehero_buff import ExampleHeroBuff
 class ExampleBuff(ExampleHeroBuff):
     """Example buff."""
 
+    __slots__ = ()
+
     # Here you can see that we define bonus haste, and damage multiplier
     # buffs that get applied on the cast.
     haste_additional_bonus = 30
@@ -35,12 +37,20 @@ class ExampleBuff(ExampleHeroBuff):
     # In this example, we apply a damage multiplier to the character
     # along with a haste modifier.
     def on_apply(self):
-        self.character.damage_multiplier += self.damage_multiplier_bonus
-        self.character.haste_additional += self.haste_additional_bonus
+        self.character.add_stat_modifier(
+            "damage_multiplier", self.damage_multiplier_bonus
+        )
+        self.character.add_stat_modifier(
+            "haste_additional", self.haste_additional_bonus
+        )
 
     # Overrides the on_remove.
     # This gets called whenever the buff or debuff gets removed from the
     # the target. In this case, we need to remove the stat bonuses.
     def on_remove(self):
-        self.character.damage_multiplier -= self.damage_multiplier_bonus
-        self.character.haste_additional -= self.haste_additional_bonus
+        self.character.add_stat_modifier(
+            "damage_multiplier", -self.damage_multiplier_bonus
+        )
+        self.character.add_stat_modifier(
+            "haste_additional", -self.haste_additional_bonus
+        )
@@ -7,6 +7,8 @@ from characters._example.examplehero_debuff import ExampleHeroDebuff
 class ExampleDebuff(ExampleHeroDebuff):
     """Example buff."""
 
+    __slots__ = ()
+
     def __init__(self):
         # As BaseDebuff and Buff come from BaseSpell you can define similar
         # variables here. In this case, we define the damage per tick.
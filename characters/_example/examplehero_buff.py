@@ -10,7 +10,7 @@ from base import BaseBuff
 class ExampleHeroBuff(BaseBuff):
     """Base class for all Example buffs."""
 
-    winter_orb_per_tick = 0
+    __slots__ = ("winter_orb_per_tick",)
 
     def __init__(
         self,
@@ -20,7 +20,7 @@ class ExampleHeroBuff(BaseBuff):
     ):
         # As always pass up the base.
         super().__init__(*args, **kwargs)
-        self.winter_orb_cost = winter_orb_per_tick
+        self.winter_orb_per_tick = winter_orb_per_tick
 
     # Note: You can define more overrides here if you wish. BaseBuffs come
     # from the BaseSpell class so all overrides are still valid here.
@@ -10,6 +10,8 @@ from base import BaseDebuff
 class ExampleHeroDebuff(BaseDebuff):
     """Base class for all Example debuffs."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         *args,
@@ -10,8 +10,10 @@ class ExampleHeroSpell(BaseSpell):
     """Defines a Hero Spell."""
 
     # Here is where you would define any additional features the hero spell
-    # Might use, in this example, a winter orb cost..
-    winter_orb_cost = 0
+    # Might use, in this example, a winter orb cost. Spells are slotted, so
+    # each attribute set on the instance is declared in __slots__. Spells
+    # that add nothing still declare an empty __slots__ = ().
+    __slots__ = ("winter_orb_cost",)
 
     # You then define the __init__ ensuring to pass up all args and kwargs.
     # You can also define other arguments, again in this example, a winter orb.
@@ -1,7 +1,5 @@
 """Module for the Ardeos Character."""
 
-import random
-
 from base import BaseCharacter
 
 from characters._example.spells import ExampleSpell, ExampleDebuff, ExampleBuff
@@ -16,7 +14,15 @@ from .utils.enums import SpellSimFellName
 class ExampleHero(BaseCharacter):
     """Defines the Example Character."""
 
-    winter_orbs = 0
+    # Characters and spells are slotted, so every attribute the hero adds on
+    # top of the base needs to be declared here. Without __slots__ the hero
+    # still works, but every instance carries a dict again.
+    __slots__ = ("winter_orbs",)
+
+    # The hero's talent enum, used by talent sweeps to list every build.
+    # Talents that do nothing in the simulation, such as defensives, can be
+    # listed in inert_talents so sweeps skip builds only differing in them.
+    talent_tree = ExampleTalents
 
     # Ensure you pass down the args and kwargs and reset any default values.
     def __init__(
@@ -42,6 +48,13 @@ class ExampleHero(BaseCharacter):
         for spell in self.spells.values():
             spell.character = self
 
+    # Simulations reuse the same hero between runs and call reset() before
+    # each one. Any resource the hero tracks needs to go back to its starting
+    # value here. Always call the base, it resets the spells and buffs.
+    def reset(self):
+        super().reset()
+        self.winter_orbs = 0
+
     # We also need to override the add_talent, as not all heroes have the same
     # talents!
     def add_talent(self, talent_identifier: str):
@@ -49,7 +62,7 @@ class ExampleHero(BaseCharacter):
         talent = ExampleTalents.get_by_identifier(talent_identifier)
         # And then apply it to the list of talents.
         if talent is not None:
-            self.talents.append(talent)
+            self.learn_talent(talent)
             # Note: If a talent were to provide a global passive to the hero.
             # EG. Rimes Avalanche giving 5% Crit Power, you would define/apply
             # That value to here.
@@ -63,8 +76,10 @@ class ExampleHero(BaseCharacter):
         self.winter_orbs = max(self.winter_orbs, 0)
 
         # In the case of Rime, she can refund Winter Orbs based on a random
-        # chance defined by her spirit % so we include that here.
-        if random.uniform(0, 100) < self.get_spirit():
+        # chance defined by her spirit % so we include that here. Always roll
+        # through the simulation's random source, giving each kind of roll its
+        # own category name so results stay reproducible from a seed.
+        if self.simulation.random.roll("spirit") < self.get_spirit():
             self.winter_orbs += amount
             self.winter_orbs = min(self.winter_orbs, 5)
 
@@ -8,6 +8,8 @@ from characters._example.buffs import ExampleBuff
 class ExampleBuffSpell(ExampleHeroSpell):
     """Defines an example spell."""
 
+    __slots__ = ()
+
     # The main difference here is that we apply a buff on cast instead of
     # dealing damage directly. In this case, the ExampleBuff we created.
     def __init__(self):
@@ -8,6 +8,8 @@ from characters._example.debuffs import ExampleDebuff
 class ExampleBuffSpell(ExampleHeroSpell):
     """Defines an example spell."""
 
+    __slots__ = ()
+
     # The main difference here is that we apply a debuff on cast instead of
     # dealing damage directly. In this case, the ExampleDebuff we created.
     def __init__(self):
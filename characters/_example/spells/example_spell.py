@@ -9,6 +9,14 @@ from characters._example.talent import ExampleTalents, ExampleBonusDamageTalent
 class ExampleSpell(ExampleHeroSpell):
     """Defines an example spell."""
 
+    __slots__ = ()
+
+    # Talents the spell checks are declared as flags. Each attribute is set
+    # to whether the character has the talent before the simulation starts,
+    # so checking it during the fight is just reading a boolean. Flags get
+    # their own slots, there is no need to add them to __slots__.
+    talent_flags = {"has_bonus_damage": ExampleTalents.EXAMPLEBONUSDAMAGE}
+
     # In this case, we define the spell name, cast time, and how much damage it
     # will do. However we also include the winter_orb_cost we defined in
     # the TemplateHeroSpell.
@@ -24,7 +32,7 @@ class ExampleSpell(ExampleHeroSpell):
     # We can apply a damage modifier based on a talent that we may have.
     def damage_modifiers(self, damage):
         # We first check to see if the talent is selected.
-        if self.character.has_talent(ExampleTalents.EXAMPLEBONUSDAMAGE):
+        if self.has_bonus_damage:
             # Then we modify the damage based on the static variable assigned.
             damage *= ExampleBonusDamageTalent.bonus_damage_for_example_spell
 
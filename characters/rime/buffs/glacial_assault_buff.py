@@ -7,6 +7,8 @@ from characters.rime.talent import GlacialAssaultTalent
 class GlacialAssaultBuff(BaseBuff):
     """Glacial Assault buff."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(
             "Glacial Assault",
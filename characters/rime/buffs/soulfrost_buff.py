@@ -6,6 +6,8 @@ from base import BaseBuff
 class SoulfrostBuff(BaseBuff):
     """Glacial Assault buff."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(
             "Soul Frost",
@@ -6,6 +6,8 @@ from characters.rime.rime_buff import RimeBuff
 class WrathOfWinterBuff(RimeBuff):
     """Glacial Assault buff."""
 
+    __slots__ = ()
+
     haste_additional_bonus = 30
     damage_multiplier_bonus = 0.15
 
@@ -21,9 +23,17 @@ class WrathOfWinterBuff(RimeBuff):
         self.character.gain_winter_orbs(1)
 
     def on_apply(self):
-        self.character.damage_multiplier += self.damage_multiplier_bonus
-        self.character.haste_additional += self.haste_additional_bonus
+        self.character.add_stat_modifier(
+            "damage_multiplier", self.damage_multiplier_bonus
+        )
+        self.character.add_stat_modifier(
+            "haste_additional", self.haste_additional_bonus
+        )
 
     def on_remove(self):
-        self.character.damage_multiplier -= self.damage_multiplier_bonus
-        self.character.haste_additional -= self.haste_additional_bonus
+        self.character.add_stat_modifier(
+            "damage_multiplier", -self.damage_multiplier_bonus
+        )
+        self.character.add_stat_modifier(
+            "haste_additional", -self.haste_additional_bonus
+        )
@@ -7,8 +7,12 @@ from characters.rime.talent import RimeTalents
 class BurstingIceDebuff(RimeDebuff):
     """Glacial Assault buff."""
 
+    __slots__ = ()
+
     maximum_possible_anima = 3
 
+    talent_flags = {"has_coalescing_ice": RimeTalents.COALESCING_ICE}
+
     def __init__(self):
         super().__init__(
             "Bursting Ice",
@@ -19,7 +23,7 @@ class BurstingIceDebuff(RimeDebuff):
         )
 
     def damage_modifiers(self, damage):
-        if self.character.has_talent(RimeTalents.COALESCING_ICE):
+        if self.has_coalescing_ice:
             coalescing_ice = RimeTalents.COALESCING_ICE.value
             return damage * (1 + (coalescing_ice.bonus_bursting_damage / 100))
 
@@ -31,7 +35,7 @@ class BurstingIceDebuff(RimeDebuff):
         anima_gain = self.anima_per_tick
 
         # TODO: Check to see if this is 1 target only.
-        if self.character.has_talent(RimeTalents.COALESCING_ICE):
+        if self.has_coalescing_ice:
             coalescing_ice = RimeTalents.COALESCING_ICE.value
             anima_gain += coalescing_ice.bonus_anima_single_target
 
@@ -8,6 +8,13 @@ from characters.rime.utils.enums import SpellSimFellName
 class DanceOfSwallowsDebuff(RimeDebuff):
     """Dance of Swallos Debuff."""
 
+    __slots__ = ()
+
+    talent_flags = {
+        "has_icy_flow": RimeTalents.ICY_FLOW,
+        "has_soulfrost_torrent": RimeTalents.SOULFROST_TORRENT,
+    }
+
     def __init__(self):
         super().__init__(
             "Dance of Swallows",
@@ -17,14 +24,14 @@ class DanceOfSwallowsDebuff(RimeDebuff):
 
     def damage(self):
         super().damage()
-        if self.character.has_talent(RimeTalents.ICY_FLOW):
+        if self.has_icy_flow:
             icy_flow = RimeTalents.ICY_FLOW.value
             self.character.spells[
                 SpellSimFellName.FREEZING_TORRENT.value
             ].update_cooldown(icy_flow.torrent_cdr_from_anima_spikes)
 
     def crit_chance_modifiers(self, crit_chance):
-        if self.character.has_talent(RimeTalents.SOULFROST_TORRENT):
+        if self.has_soulfrost_torrent:
             crit_chance += (
                 SoulfrostTorrentTalent.anima_and_swallow_crit_bonus
                 if not self.character.simulation.is_deterministic
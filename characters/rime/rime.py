@@ -1,7 +1,5 @@
 """Module for the Rime Character."""
 
-import random
-
 from base import BaseCharacter
 from base.character import CharacterTalentT
 from characters.rime.spells import (
@@ -25,9 +23,11 @@ from .utils.enums import SpellSimFellName
 class Rime(BaseCharacter):
     """Stat Point DR"""
 
-    anima_spikes = None
-    anima = 0
-    winter_orbs = 0
+    __slots__ = ("anima", "winter_orbs", "anima_spikes", "dance_of_swallows")
+
+    talent_tree = RimeTalents
+    # Tundra Guard is defensive only.
+    inert_talents = (RimeTalents.TUNDRA_GUARD,)
 
     def __init__(self, intellect, crit, expertise, haste, spirit):
         super().__init__(intellect, crit, expertise, haste, spirit)
@@ -57,6 +57,13 @@ class Rime(BaseCharacter):
         for spell in self.spells.values():
             spell.character = self
 
+    def reset(self):
+        super().reset()
+        self.anima = 0
+        self.winter_orbs = 0
+        self.anima_spikes.reset()
+        self.dance_of_swallows.reset()
+
     def gain_anima(self, amount):
         """Gain Anima"""
         self.anima += amount
@@ -80,13 +87,15 @@ class Rime(BaseCharacter):
         """Lose Winter Orbs"""
         self.winter_orbs -= amount
         self.winter_orbs = max(self.winter_orbs, 0)
-        if random.uniform(0, 100) < self.get_spirit():
+        if self.simulation.random.roll("spirit") < self.get_spirit():
             self.winter_orbs += amount
             self.winter_orbs = min(self.winter_orbs, 5)
 
     def add_talent(self, talent_identifier: str):
         talent = RimeTalents.get_by_identifier(talent_identifier)
         if talent is not None:
-            self.talents.append(talent)
+            self.learn_talent(talent)
             if talent == RimeTalents.AVALANCHE:
-                self.crit_power_multiplier += AvalancheTalent.bonus_crit_power
+                self.add_stat_modifier(
+                    "crit_power_multiplier", AvalancheTalent.bonus_crit_power
+                )
@@ -6,9 +6,7 @@ from base import BaseDebuff
 class RimeDebuff(BaseDebuff):
     """Base class for all Rime debuffs."""
 
-    anima_gain = 0
-    winter_orb_cost = 0
-    anima_per_tick = 0
+    __slots__ = ("anima_gain", "winter_orb_cost", "anima_per_tick")
 
     def __init__(
         self,
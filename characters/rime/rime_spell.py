@@ -10,9 +10,9 @@ from characters.rime.buffs import SoulfrostBuff
 class RimeSpell(BaseSpell):
     """Base information for Rime Spells"""
 
-    anima_gain = 0
-    winter_orb_cost = 0
-    anima_per_tick = 0
+    __slots__ = ("anima_gain", "winter_orb_cost", "anima_per_tick")
+
+    talent_flags = {"has_soulfrost_torrent": RimeTalents.SOULFROST_TORRENT}
 
     def __init__(
         self,
@@ -34,7 +34,7 @@ class RimeSpell(BaseSpell):
         )
 
     def on_crit(self):
-        if self.character.has_talent(RimeTalents.SOULFROST_TORRENT):
+        if self.has_soulfrost_torrent:
             # TODO: Check for PPM.
             SoulfrostBuff().apply(self.character)
 
@@ -8,19 +8,23 @@ from characters.rime.utils.enums import SpellSimFellName
 class AnimaSpikes(RimeSpell):
     """Anima Spikes Spell"""
 
+    __slots__ = ()
+
+    talent_flags = {"has_icy_flow": RimeTalents.ICY_FLOW}
+
     def __init__(self):
         super().__init__("Anima Spikes", damage_percent=36)
 
     def damage(self):
         super().damage()
-        if self.character.has_talent(RimeTalents.ICY_FLOW):
+        if self.has_icy_flow:
             icy_flow = RimeTalents.ICY_FLOW.value
             self.character.spells[
                 SpellSimFellName.FREEZING_TORRENT.value
             ].update_cooldown(icy_flow.torrent_cdr_from_anima_spikes)
 
     def crit_chance_modifiers(self, crit_chance):
-        if self.character.has_talent(RimeTalents.SOULFROST_TORRENT):
+        if self.has_soulfrost_torrent:
             crit_chance += (
                 SoulfrostTorrentTalent.anima_and_swallow_crit_bonus
                 if not self.character.simulation.is_deterministic
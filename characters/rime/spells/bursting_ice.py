@@ -7,6 +7,8 @@ from characters.rime.debuffs import BurstingIceDebuff
 class BurstingIce(RimeSpell):
     """Bursting Ice Spell"""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(
             "Bursting Ice",
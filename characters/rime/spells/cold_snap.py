@@ -9,6 +9,10 @@ from characters.rime.utils.enums import SpellSimFellName
 class ColdSnap(RimeSpell):
     """Cold Snap Spell"""
 
+    __slots__ = ("_dance_of_swallows_trigger_count",)
+
+    talent_flags = {"has_glacial_assault": RimeTalents.GLACIAL_ASSAULT}
+
     def __init__(self):
         super().__init__(
             "Cold Snap", damage_percent=204, winter_orb_cost=-1, cooldown=8
@@ -17,7 +21,7 @@ class ColdSnap(RimeSpell):
         self._dance_of_swallows_trigger_count = 10
 
     def apply_buff(self):
-        if self.character.has_talent(RimeTalents.GLACIAL_ASSAULT):
+        if self.has_glacial_assault:
             GlacialAssaultBuff().apply(self.character)
 
     def on_cast_complete(self):
@@ -7,6 +7,8 @@ from characters.rime.debuffs import DanceOfSwallowsDebuff
 class DanceOfSwallows(RimeSpell):
     """Dance of Swallows Spell"""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(
             "Dance of Swallows",
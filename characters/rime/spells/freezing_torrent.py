@@ -13,11 +13,16 @@ from characters.rime.utils.enums import SpellSimFellName
 class FreezingTorrent(RimeSpell):
     """Freezing Torrent Spell"""
 
+    __slots__ = ("in_soulfrost",)
+
     # TODO: Future note to myself in the future:
     # I need to code PPM for Soulfrost which is at 1.5 PPM According to Devs.
     # Use WoW's RPPM calculations for this.
 
-    in_soulfrost = False
+    talent_flags = {
+        "has_chillblain": RimeTalents.CHILLBLAIN,
+        "has_unrelenting_ice": RimeTalents.UNRELENTING_ICE,
+    }
 
     def __init__(self):
         super().__init__(
@@ -29,11 +34,12 @@ class FreezingTorrent(RimeSpell):
             channeled=True,
             base_tick_duration=0.4,
         )
+        self.in_soulfrost = False
 
     def cast(self, do_damage=True):
-        if self.character.has_talent(
-            RimeTalents.SOULFROST_TORRENT
-        ) and self.character.has_buff(SpellSimFellName.SOUL_FROST.value):
+        if self.has_soulfrost_torrent and self.character.has_buff(
+            SpellSimFellName.SOUL_FROST.value
+        ):
             if self.channeled:
                 self.in_soulfrost = True
                 self.character.simulation.gcd = self.get_gcd()
@@ -61,8 +67,12 @@ class FreezingTorrent(RimeSpell):
             self.in_soulfrost = False
             super().cast(do_damage)
 
+    def reset(self):
+        super().reset()
+        self.in_soulfrost = False
+
     def effective_cast_time(self):
-        if self.character.has_talent(RimeTalents.SOULFROST_TORRENT):
+        if self.has_soulfrost_torrent:
             if self.character.has_buff(SpellSimFellName.SOUL_FROST.value):
                 return (
                     super().effective_cast_time()
@@ -70,8 +80,19 @@ class FreezingTorrent(RimeSpell):
                 )
         return super().effective_cast_time()
 
+    def damage(self):
+        damage = super().damage()
+        # Chillblain splashes part of each hit onto nearby enemies.
+        if self.has_chillblain:
+            self.cleave(
+                damage * ChillblainTalent.percentage_of_damage / 100,
+                ChillblainTalent.maximum_enemies,
+                "Chillblain",
+            )
+        return damage
+
     def damage_modifiers(self, damage):
-        if self.character.has_talent(RimeTalents.CHILLBLAIN):
+        if self.has_chillblain:
             damage = damage * (
                 1 + (ChillblainTalent.bonus_torrent_damage / 100)
             )
@@ -84,7 +105,7 @@ class FreezingTorrent(RimeSpell):
     def on_tick(self):
         self.character.gain_anima(self.anima_per_tick)
 
-        if self.character.has_talent(RimeTalents.UNRELENTING_ICE):
+        if self.has_unrelenting_ice:
             self.character.spells[
                 SpellSimFellName.BURSTING_ICE.value
             ].update_cooldown(
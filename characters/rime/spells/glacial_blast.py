@@ -9,6 +9,10 @@ from characters.rime.utils.enums import SpellSimFellName
 class GlacialBlast(RimeSpell):
     """Glacial Blast Spell"""
 
+    __slots__ = ()
+
+    talent_flags = {"has_glacial_assault": RimeTalents.GLACIAL_ASSAULT}
+
     def __init__(self):
         super().__init__(
             "Glacial Blast",
@@ -41,7 +45,7 @@ class GlacialBlast(RimeSpell):
     def crit_chance_modifiers(self, crit_chance):
         # Checks to see if Glacial Assault is talented,
         # and if it is increases the Crit.
-        if self.character.has_talent(RimeTalents.GLACIAL_ASSAULT):
+        if self.has_glacial_assault:
             crit_chance += (
                 GlacialAssaultTalent.bonus_critical_strike
                 if not self.character.simulation.is_deterministic
@@ -54,7 +58,7 @@ class GlacialBlast(RimeSpell):
         and at maximum stacks."""
 
         if (
-            self.character.has_talent(RimeTalents.GLACIAL_ASSAULT)
+            self.has_glacial_assault
             and self.character.has_buff(SpellSimFellName.GLACIAL_ASSAULT.value)
             and self.character.get_buff(
                 SpellSimFellName.GLACIAL_ASSAULT.value
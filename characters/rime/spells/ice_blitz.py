@@ -7,6 +7,8 @@ from characters.rime.buffs import IceBlitzBuff
 class IceBlitz(RimeSpell):
     """Ice Blitz Spell"""
 
+    __slots__ = ()
+
     ice_blitz_damage_multiplier = 0.15
 
     def __init__(self):
@@ -1,6 +1,5 @@
 """Module for Ice Comet Spell"""
 
-import random
 from characters.rime import RimeSpell
 from characters.rime.talent import AvalancheTalent, RimeTalents
 
@@ -8,15 +7,17 @@ from characters.rime.talent import AvalancheTalent, RimeTalents
 class IceComet(RimeSpell):
     """Ice Comet Spell"""
 
+    __slots__ = ()
+
+    talent_flags = {"has_avalanche": RimeTalents.AVALANCHE}
+
     def __init__(self):
         super().__init__("Ice Comet", damage_percent=300, winter_orb_cost=3)
 
     def on_cast_complete(self):
-        if self.character.has_talent(RimeTalents.AVALANCHE):
-            if random.uniform(0, 100) < AvalancheTalent.double_comet_chance:
+        if self.has_avalanche:
+            rng = self.character.simulation.random
+            if rng.roll("avalanche") < AvalancheTalent.double_comet_chance:
                 self.damage()
-                if (
-                    random.uniform(0, 100)
-                    < AvalancheTalent.triple_comet_chance
-                ):
+                if rng.roll("avalanche") < AvalancheTalent.triple_comet_chance:
                     self.damage()
@@ -7,6 +7,8 @@ from characters.rime.buffs import WrathOfWinterBuff
 class WrathOfWinter(RimeSpell):
     """Wrath of Winter Spell"""
 
+    __slots__ = ()
+
     haste_additional_bonus = 30
     damage_multiplier_bonus = 0.15
 
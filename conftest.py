@@ -0,0 +1 @@
+"""Lets the tests import the sim's modules from the repository root."""
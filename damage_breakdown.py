@@ -0,0 +1,118 @@
+"""Module for the per-spell damage breakdown."""
+
+from typing import Dict, List
+
+from streaming_stats import MeanVariance
+
+
+class SpellCounters:
+    """Class for the per-spell counters of a single simulation.
+
+    Each spell name gets a slot, an index into flat lists of counters, the
+    first time it is recorded. Spells cache their slot, and other names
+    are looked up by hash, so recording a hit is a few list increments.
+    """
+
+    __slots__ = ("names", "damage", "hits", "crits", "casts", "_slots")
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._slots: Dict[str, int] = {}
+        self.damage: List[float] = []
+        self.hits: List[int] = []
+        self.crits: List[int] = []
+        self.casts: List[int] = []
+
+    def slot(self, name: str) -> int:
+        """Returns the slot of the spell name, adding one if needed."""
+        slot = self._slots.get(name)
+        if slot is not None:
+            return slot
+
+        slot = self._slots[name] = len(self.names)
+        self.names.append(name)
+        self.damage.append(0.0)
+        self.hits.append(0)
+        self.crits.append(0)
+        self.casts.append(0)
+        return slot
+
+    def clear(self) -> None:
+        """Zeroes every counter, keeping the slots."""
+        slots = len(self.names)
+        self.damage[:] = [0.0] * slots
+        self.hits[:] = [0] * slots
+        self.crits[:] = [0] * slots
+        self.casts[:] = [0] * slots
+
+
+class SpellBreakdown:
+    """Class for the results of a single spell over many iterations."""
+
+    __slots__ = ("share", "damage", "hits", "crits", "casts")
+
+    def __init__(self):
+        # Share of each iteration's damage, over iterations the spell was
+        # used in. DamageBreakdown accounts for the others.
+        self.share = MeanVariance()
+        self.damage = 0.0
+        self.hits = 0
+        self.crits = 0
+        self.casts = 0
+
+    def merge(self, other: "SpellBreakdown") -> None:
+        """Merges the results of another breakdown of the spell."""
+        self.share.merge(other.share)
+        self.damage += other.damage
+        self.hits += other.hits
+        self.crits += other.crits
+        self.casts += other.casts
+
+
+class DamageBreakdown:
+    """Class for the per-spell damage over many iterations, mergeable across
+    chunks and worker processes."""
+
+    def __init__(self):
+        self.iterations = 0
+        self.spells: Dict[str, SpellBreakdown] = {}
+
+    def add(self, counters: SpellCounters, total_damage: float) -> None:
+        """Adds the counters of a finished simulation."""
+        self.iterations += 1
+
+        for slot, name in enumerate(counters.names):
+            if not counters.hits[slot] and not counters.casts[slot]:
+                continue
+
+            spell = self.spells.get(name)
+            if spell is None:
+                spell = self.spells[name] = SpellBreakdown()
+
+            spell.share.add(
+                counters.damage[slot] / total_damage if total_damage else 0
+            )
+            spell.damage += counters.damage[slot]
+            spell.hits += counters.hits[slot]
+            spell.crits += counters.crits[slot]
+            spell.casts += counters.casts[slot]
+
+    def merge(self, other: "DamageBreakdown") -> None:
+        """Merges the results of another breakdown into this one."""
+        self.iterations += other.iterations
+
+        for name, other_spell in other.spells.items():
+            spell = self.spells.get(name)
+            if spell is None:
+                spell = self.spells[name] = SpellBreakdown()
+            spell.merge(other_spell)
+
+    def share(self, name: str) -> MeanVariance:
+        """Returns the damage share of the spell over every iteration,
+        counting iterations it was not used in as zero."""
+        share = MeanVariance()
+        share.merge(self.spells[name].share)
+        share.merge(
+            MeanVariance.of_zeros(self.iterations - share.count),
+        )
+        return share
@@ -0,0 +1,258 @@
+"""Module for the structured simulation event log."""
+
+import json
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, TextIO
+
+from rich import print  # pylint: disable=redefined-builtin
+from rich.text import Text
+
+# Events kept by default. Enough for the last minute or so of a fight.
+DEFAULT_CAPACITY = 4096
+
+
+class SimEvent:
+    """Base class for events recorded during a simulation.
+
+    Events only store their fields. Text is built by format(), which is only
+    called when a sink writes the event, so recording stays cheap.
+    """
+
+    __slots__ = ("time",)
+
+    kind = "event"
+
+    def __init__(self, time: float):
+        self.time = time
+
+    def describe(self) -> str:
+        """Returns the rich markup describing the event."""
+        return ""
+
+    def format(self) -> str:
+        """Returns the event as a line of rich markup."""
+        return f"Time {self.time:.2f}: {self.describe()}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the event's fields, for structured sinks."""
+        fields = {"kind": self.kind}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                fields[name] = getattr(self, name)
+        return fields
+
+
+class GcdEvent(SimEvent):
+    """Event for the simulation waiting out the global cooldown."""
+
+    __slots__ = ("gcd",)
+
+    kind = "gcd"
+
+    def __init__(self, time: float, gcd: float):
+        super().__init__(time)
+        self.gcd = gcd
+
+    def describe(self) -> str:
+        return f"GCD: {self.gcd:.2f} | [grey37]Updating time by GCD"
+
+
+class IdleEvent(SimEvent):
+    """Event for the simulation jumping to the next scheduled event."""
+
+    __slots__ = ("next_event_time",)
+
+    kind = "idle"
+
+    def __init__(self, time: float, next_event_time: float):
+        super().__init__(time)
+        self.next_event_time = next_event_time
+
+    def describe(self) -> str:
+        return (
+            "No Spell Ready | [grey37]Jumping to next event at "
+            + f"{self.next_event_time:.2f}"
+        )
+
+
+class ActionCheckEvent(SimEvent):
+    """Event for the action list checking an action."""
+
+    __slots__ = ("action", "condition", "conditions_met", "spell_ready")
+
+    kind = "action_check"
+
+    def __init__(
+        self,
+        time: float,
+        action: str,
+        condition: Optional[str],
+        conditions_met: bool,
+        spell_ready: bool,
+    ):
+        super().__init__(time)
+        self.action = action
+        self.condition = condition
+        self.conditions_met = conditions_met
+        self.spell_ready = spell_ready
+
+    def format(self) -> str:
+        return (
+            "[grey37]--------------------------[/grey37]"
+            + f"\nAction: [dark_magenta]'{self.action}'"
+            + f"[/dark_magenta], Conditions: {self.condition}"
+            + f"\n\tCondition Results: {self.conditions_met}"
+            + f"\n\tSpell Ready: {self.spell_ready}"
+            + "\n\t=====================\n"
+        )
+
+
+class CastEvent(SimEvent):
+    """Event for a spell being cast."""
+
+    __slots__ = ("spell",)
+
+    kind = "cast"
+
+    def __init__(self, time: float, spell: str):
+        super().__init__(time)
+        self.spell = spell
+
+    def describe(self) -> str:
+        return f"🔮 Casting [cornflower_blue]{self.spell}[/cornflower_blue]"
+
+
+class DamageEvent(SimEvent):
+    """Event for a spell dealing damage."""
+
+    __slots__ = ("spell", "damage", "is_crit", "targets")
+
+    kind = "damage"
+
+    def __init__(
+        self,
+        time: float,
+        spell: str,
+        damage: float,
+        is_crit: bool,
+        targets: int = 1,
+    ):
+        super().__init__(time)
+        self.spell = spell
+        self.damage = damage
+        self.is_crit = is_crit
+        self.targets = targets
+
+    def describe(self) -> str:
+        return (
+            f"💥 [cornflower_blue]{self.spell}[/cornflower_blue] "
+            + f"deals [bold red]{self.damage:.2f}[/bold red] damage"
+            + (f" to {self.targets} enemies" if self.targets > 1 else "")
+            + (" (Crit)" if self.is_crit else "")
+        )
+
+
+class AuraEvent(SimEvent):
+    """Event for a buff or debuff being applied, reapplied, updated
+    or removed."""
+
+    __slots__ = ("action", "aura", "is_debuff")
+
+    kind = "aura"
+
+    _descriptions = {
+        "apply": "✔️ Applied {aura} to {target}.",
+        "reapply": "🔄 Re-Applied {aura} to {target}.",
+        "update": "🔄 Updating {aura} remaining duration",
+        "remove": "❌ Removed {aura} from {target}.",
+    }
+
+    def __init__(self, time: float, action: str, aura: str, is_debuff: bool):
+        super().__init__(time)
+        self.action = action
+        self.aura = aura
+        self.is_debuff = is_debuff
+
+    def describe(self) -> str:
+        if self.is_debuff:
+            aura = f"[deep_pink4]{self.aura} (Debuff)[/deep_pink4]"
+        else:
+            aura = f"[dark_green]{self.aura} (Buff)[/dark_green]"
+
+        return self._descriptions[self.action].format(
+            aura=aura, target="enemy" if self.is_debuff else "character"
+        )
+
+
+class ConsoleSink:
+    """Sink printing events to the console as they are recorded."""
+
+    def write(self, event: SimEvent) -> None:
+        """Prints the event."""
+        print(event.format())
+
+    def close(self) -> None:
+        """Nothing to close for the console."""
+
+
+class FileSink:
+    """Sink writing events to a file, as plain text or JSON lines."""
+
+    def __init__(self, path: str, as_json: bool = False):
+        self.path = path
+        self.as_json = as_json
+        self._file: TextIO = open(  # pylint: disable=consider-using-with
+            path, "w", encoding="utf-8"
+        )
+
+    def write(self, event: SimEvent) -> None:
+        """Writes the event as a line of the file."""
+        if self.as_json:
+            self._file.write(json.dumps(event.to_dict()) + "\n")
+        else:
+            self._file.write(Text.from_markup(event.format()).plain + "\n")
+
+    def close(self) -> None:
+        """Closes the file."""
+        self._file.close()
+
+
+class EventLog:
+    """Class for the event log of a simulation.
+
+    Recorded events are passed to every sink and kept in a ring buffer of
+    the most recent ones, which can be inspected after a run. A simulation
+    without an event log pays a single None check per event site.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        sinks: Optional[Iterable[Any]] = None,
+    ):
+        self.events: Deque[SimEvent] = deque(maxlen=capacity)
+        self.sinks: List[Any] = list(sinks or [])
+
+    def record(self, event: SimEvent) -> None:
+        """Records an event."""
+        self.events.append(event)
+        for sink in self.sinks:
+            sink.write(event)
+
+    def clear(self) -> None:
+        """Clears the ring buffer, keeping the sinks."""
+        self.events.clear()
+
+    def since(self, time: float) -> List[SimEvent]:
+        """Returns the buffered events from the given time on."""
+        return [event for event in self.events if event.time >= time]
+
+    def dump(self, sink: Any, since: float = float("-inf")) -> None:
+        """Writes the buffered events from the given time on to a sink."""
+        for event in self.since(since):
+            sink.write(event)
+
+    def close(self) -> None:
+        """Closes every sink."""
+        for sink in self.sinks:
+            sink.close()
@@ -1,7 +1,9 @@
 """Main file for the rework sim."""
 
 import argparse
-from typing import Optional
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
 from rich import box
 from rich.console import Console
 from rich.table import Table
@@ -17,25 +19,41 @@ from rich.progress import (
 from simfell_parser.simfile_parser import SimFileParser, SimFellConfiguration
 from simfell_parser.utils import character_classes, default_simfell_files
 from sim import Simulation
+from streaming_stats import CONFIDENCE_Z, REPORTED_QUANTILES
+from timeline import TimelineResult
+from profiling import hot_functions_table, profile
+from event_log import ConsoleSink, EventLog, FileSink
+from top_gear import top_gear_profilesets
+from runner import (
+    ProfilesetResult,
+    group_talent_builds,
+    run_iterations,
+    run_profilesets,
+    run_stat_weights,
+    run_talent_sweep,
+    run_to_target_error,
+    resolve_worker_count,
+    STAT_WEIGHT_STATS,
+)
+
+
+def simfile_path(arguments: argparse.Namespace) -> str:
+    """Returns the SimFell file given, or the hero's default one."""
+    if arguments.simfile:
+        return arguments.simfile
+    if arguments.character_hero:
+        return default_simfell_files[arguments.character_hero]
+    raise ValueError(
+        "Either a Simfell File needs to be defined {-f} "
+        + "or a Hero needs to be defined {-ch}."
+    )
 
 
 def handle_configuration(
     arguments: argparse.Namespace,
 ) -> SimFellConfiguration:
     """Handles the configuration based on the arguments."""
-    if arguments.simfile:
-        simfile_parser = SimFileParser(arguments.simfile)
-        configuration = simfile_parser.parse()
-    elif arguments.character_hero:
-        simfile_parser = SimFileParser(
-            default_simfell_files[arguments.character_hero]
-        )
-        configuration = simfile_parser.parse()
-    else:
-        raise ValueError(
-            "Either a Simfell File needs to be defined {-f} "
-            + "or a Hero needs to be defined {-ch}."
-        )
+    configuration = SimFileParser(simfile_path(arguments)).parse()
 
     if arguments.enemy_count:
         configuration.enemies = arguments.enemy_count
@@ -64,24 +82,35 @@ def handle_configuration(
                     + f"Invalid stat: {stat}"
                 )
 
-        hero = (
-            arguments.character_hero
-            if arguments.character_hero is not None
-            else configuration.hero
-        )
+        if arguments.character_hero is not None:
+            configuration.hero = arguments.character_hero
 
-        configuration.character = character_classes[hero](
-            intellect=stats[0],
-            crit=stats[1],
-            expertise=stats[2],
-            haste=stats[3],
-            spirit=stats[4],
-        )
+        configuration.intellect = stats[0]
+        configuration.crit = stats[1]
+        configuration.expertise = stats[2]
+        configuration.haste = stats[3]
+        configuration.spirit = stats[4]
 
     if arguments.duration:
         configuration.duration = arguments.duration
     if arguments.run_count:
         configuration.run_count = arguments.run_count
+    if arguments.profile:
+        # Worker processes are not profiled, so everything runs in this one.
+        configuration.run_count = arguments.profile
+        arguments.workers = 1
+    if arguments.target_error:
+        configuration.target_error = arguments.target_error
+    if arguments.timeline:
+        configuration.timeline_bucket = arguments.timeline
+    # debug_sim writes its whole event log to the file instead.
+    if arguments.log_file and arguments.simulation_type != "debug_sim":
+        configuration.event_log_file = arguments.log_file
+
+    # Rebuild the character so it picks up the overridden stats and talents.
+    # e.g. Combination of "2-12-3" means Talent 1.2, 2.1, 2.2, 3.3
+    # = Coalescing Ice, Unrelenting Ice, Icy Flow, Soulfrost Torrent
+    configuration.character = configuration.build_character()
 
     return configuration
 
@@ -95,6 +124,8 @@ def main(arguments: argparse.Namespace):
 
     console = Console()
     table = Table(title="DPS Simulation", box=box.SIMPLE)
+    # Further tables, such as the timeline, printed after the main one.
+    extra_tables: List[Table] = []
     table.add_column(
         "Attribute", style="blue", justify="center", vertical="middle"
     )
@@ -104,17 +135,22 @@ def main(arguments: argparse.Namespace):
     table.add_row("Enemy Count", str(configuration.enemies))
     table.add_row("Duration", str(configuration.duration))
     table.add_row("Run Count", str(configuration.run_count))
+    if configuration.target_error:
+        table.add_row("Target Error", f"{configuration.target_error:g}")
+    table.add_row("Workers", str(resolve_worker_count(arguments.workers)))
     if arguments.simulation_type == "stat_weights":
         table.add_row("Stat Weights Gain", str(arguments.stat_weights_gain))
+    if arguments.simulation_type == "talent_sweep":
+        table.add_row("Talent Picks Per Row", str(arguments.talent_picks))
+        if arguments.talent_filter:
+            table.add_row("Talent Filter", arguments.talent_filter)
+    if arguments.race_top and arguments.simulation_type in (
+        "talent_sweep",
+        "profilesets",
+        "top_gear",
+    ):
+        table.add_row("Race Top", str(arguments.race_top))
 
-    # Parse the talent tree argument.
-    # e.g. Combination of "2-12-3" means Talent 1.2, 2.1, 2.2, 3.3
-    # = Coalescing Ice, Unrelenting Ice, Icy Flow, Soulfrost Torrent
-    if configuration.talents:
-        talents = configuration.talents.split("-")
-        for index, talent in enumerate(talents):
-            for i in talent:
-                configuration.character.add_talent(f"{index+1}.{i}")
     table.add_section()
     table.add_row("Hero", configuration.hero)
     table.add_row(
@@ -156,47 +192,101 @@ def main(arguments: argparse.Namespace):
         end_section=True,
     )
 
-    # Sim Options - Uncomment one to run.
-    match arguments.simulation_type:
-        case "average_dps":
-            average_dps(
-                table,
-                configuration,
-                arguments.experimental_feature,
-            )
-        case "stat_weights":
-            raise NotImplementedError("Stat Weights not implemented yet.")
-            # stat_weights(
-            #     table,
-            #     character,
-            #     configuration.duration,
-            #     configuration.run_count,
-            #     arguments.stat_weights_gain,
-            #     arguments.experimental_feature,
-            #     configuration.enemies,
-            # )
-        case "debug_sim":
-            debug_sim(
-                table,
-                configuration,
-            )
+    def run_simulation() -> None:
+        match arguments.simulation_type:
+            case "average_dps":
+                average_dps(
+                    table,
+                    configuration,
+                    arguments.experimental_feature,
+                    workers=arguments.workers,
+                    extra_tables=extra_tables,
+                )
+            case "stat_weights":
+                stat_weights(
+                    table,
+                    configuration,
+                    arguments.stat_weights_gain,
+                    workers=arguments.workers,
+                )
+            case "talent_sweep":
+                talent_sweep(
+                    table,
+                    configuration,
+                    arguments.talent_picks,
+                    arguments.talent_filter,
+                    workers=arguments.workers,
+                    race_top=arguments.race_top,
+                    extra_tables=extra_tables,
+                )
+            case "profilesets":
+                profilesets(
+                    table,
+                    configuration,
+                    SimFileParser(simfile_path(arguments)),
+                    workers=arguments.workers,
+                    race_top=arguments.race_top,
+                    extra_tables=extra_tables,
+                )
+            case "top_gear":
+                top_gear(
+                    table,
+                    configuration,
+                    workers=arguments.workers,
+                    race_top=arguments.race_top,
+                    extra_tables=extra_tables,
+                )
+            case "debug_sim":
+                debug_sim(
+                    table,
+                    configuration,
+                    log_file=arguments.log_file,
+                )
+
+    if arguments.profile:
+        _, stats = profile(run_simulation, arguments.profile_output)
+        extra_tables.append(hot_functions_table(stats))
+        table.add_row(
+            "Profile",
+            f"{arguments.profile_output}.pstats\n"
+            + f"{arguments.profile_output}.speedscope.json",
+            end_section=True,
+        )
+    else:
+        run_simulation()
 
     # Print the final results
     console.print("\n")
     console.print(table)
+    for extra_table in extra_tables:
+        console.print(extra_table)
 
 
-def debug_sim(table: Table, configuration: SimFellConfiguration) -> None:
+def debug_sim(
+    table: Table,
+    configuration: SimFellConfiguration,
+    log_file: Optional[str] = None,
+) -> None:
     """Runs a debug simulation.
     Creates a deterministic simulation with 0 crit and spirit.
+    Events are printed, and also written to the log file if one is given.
     """
 
+    sinks = [ConsoleSink()]
+    if log_file:
+        sinks.append(FileSink(log_file, as_json=log_file.endswith(".jsonl")))
+    event_log = EventLog(sinks=sinks)
+
     sim = Simulation(
         configuration,
         do_debug=True,
         is_deterministic=True,
+        event_log=event_log,
     )
-    dps = sim.run(detailed_debug=False)
+    try:
+        dps = sim.run(detailed_debug=False)
+    finally:
+        event_log.close()
 
     table.add_row("Total DPS", f"[bold magenta]{dps:.2f}", end_section=True)
 
@@ -206,8 +296,11 @@ def average_dps(
     configuration: SimFellConfiguration,
     use_experimental: bool,
     stat_name: Optional[str] = None,
+    workers: int = 1,
+    extra_tables: Optional[List[Table]] = None,
 ) -> float:
-    """Runs a simulation and returns the average DPS."""
+    """Runs a simulation and returns the average DPS.
+    Adds the timeline table to the extra tables if one was recorded."""
 
     with Progress(
         TextColumn(
@@ -221,27 +314,29 @@ def average_dps(
         TextColumn("•"),
         TimeRemainingColumn(),
     ) as progress:
-        dps_running_total = 0
-        dps_lowest = float("inf")
-        dps_highest = float("-inf")
-
         task = progress.add_task(f"{stat_name}", total=configuration.run_count)
 
-        for _ in range(configuration.run_count):
-            sim = Simulation(
+        def on_progress(advance: int) -> None:
+            progress.update(task, advance=advance)
+
+        # With a target error the run count is only the upper limit.
+        if configuration.target_error:
+            result = run_to_target_error(
                 configuration,
-                do_debug=False,
-                is_deterministic=False,
+                configuration.target_error,
+                configuration.run_count,
+                workers=workers,
+                on_progress=on_progress,
             )
-            dps = sim.run()
-
-            progress.update(task, advance=1)
-
-            dps_lowest = min(dps, dps_lowest)
-            dps_highest = max(dps, dps_highest)
-
-            dps_running_total += dps
-        avg_dps = dps_running_total / configuration.run_count
+            progress.update(task, total=result.iterations)
+        else:
+            result = run_iterations(
+                configuration,
+                configuration.run_count,
+                workers=workers,
+                on_progress=on_progress,
+            )
+        avg_dps = result.average_dps
 
     table.add_row(
         "Average DPS" if not stat_name else f"Average DPS ({stat_name})",
@@ -249,50 +344,423 @@ def average_dps(
     )
     table.add_row(
         "Lowest DPS" if not stat_name else f"Lowest DPS ({stat_name})",
-        f"[bold magenta]{dps_lowest:.2f}",
+        f"[bold magenta]{result.dps.minimum:.2f}",
     )
     table.add_row(
         "Highest DPS" if not stat_name else f"Highest DPS ({stat_name})",
-        f"[bold magenta]{dps_highest:.2f}",
+        f"[bold magenta]{result.dps.maximum:.2f}",
+    )
+    table.add_row(
+        "DPS Std Dev" if not stat_name else f"DPS Std Dev ({stat_name})",
+        f"[bold magenta]{result.dps.standard_deviation:.2f}",
+    )
+    # A single iteration has no error to show.
+    if result.dps.count < 2:
+        error = interval = "n/a"
+    else:
+        lower, upper = result.dps.confidence_interval()
+        error = f"{result.standard_error:.2f}"
+        interval = f"{lower:.2f} - {upper:.2f}"
+    table.add_row(
+        "DPS Error" if not stat_name else f"DPS Error ({stat_name})",
+        f"[bold magenta]{error}",
+    )
+    table.add_row(
+        "95% CI" if not stat_name else f"95% CI ({stat_name})",
+        f"[bold magenta]{interval}",
+    )
+    table.add_row(
+        "DPS Percentiles" if not stat_name else f"Percentiles ({stat_name})",
+        "\n".join(
+            f"p{quantile * 100:g}: {result.dps.quantile(quantile):.2f}"
+            for quantile in REPORTED_QUANTILES
+        ),
+    )
+    table.add_row(
+        "Iterations" if not stat_name else f"Iterations ({stat_name})",
+        f"[bold magenta]{result.iterations}",
         end_section=True,
     )
 
     # Experimental: Damage Table
     # ---------------------------
     if not stat_name and use_experimental:
-        damage_sum = sum(damage for _, damage in sim.damage_table.items())
-
-        # Sort sim.damage_table by damage dealt from highest to lowest.
-        # Remove rows with 0 values
-        sorted_damage_table = {
-            k: v
-            for k, v in sorted(
-                sim.damage_table.items(),
-                key=lambda item: item[1],
-                reverse=True,
-            )
-            if v > 0
-        }
+        breakdown = result.breakdown
+
+        # Sort the damage table by damage dealt from highest to lowest.
+        # Spells that were cast but never dealt damage are left out.
+        sorted_spells = sorted(
+            (
+                (name, spell)
+                for name, spell in breakdown.spells.items()
+                if spell.damage > 0
+            ),
+            key=lambda item: item[1].damage,
+            reverse=True,
+        )
 
         table.add_row(
-            "[bold yellow]-------- Experimental!",
-            "[bold yellow]Do not trust! --------",
+            "[bold yellow]-------- Damage",
+            "[bold yellow]Breakdown --------",
         )
 
         # make first 3 rows bold
-        for i, (spell, damage) in enumerate(sorted_damage_table.items()):
-            spell_name = f"[bold]{spell}" if i < 3 else spell
-            damage = (
-                f"[bold dark_red]{round(damage, 3)} ({damage/damage_sum:.2%})"
-                if i < 3
-                else f"[magenta]{round(damage, 3)} ({damage/damage_sum:.2%})"
+        for i, (name, spell) in enumerate(sorted_spells):
+            share = breakdown.share(name)
+            spell_dps = (
+                spell.damage / breakdown.iterations / configuration.duration
+            )
+            casts = (
+                f" | {spell.casts / breakdown.iterations:.1f} casts"
+                if spell.casts
+                else ""
+            )
+            share_error = (
+                f"± {CONFIDENCE_Z * share.standard_error:.2%}"
+                if share.count > 1
+                else "± n/a"
+            )
+            details = (
+                f"{spell_dps:.2f} DPS ({share.mean:.2%} {share_error})"
+                + f"\n{spell.hits / breakdown.iterations:.1f} hits"
+                + f" | {spell.crits / spell.hits:.1%} crit{casts}"
             )
 
-            table.add_row(spell_name, damage)
+            table.add_row(
+                f"[bold]{name}" if i < 3 else name,
+                (
+                    f"[bold dark_red]{details}"
+                    if i < 3
+                    else f"[magenta]{details}"
+                ),
+            )
+
+    if result.timeline is not None and extra_tables is not None:
+        extra_tables.append(timeline_table(result.timeline))
 
     return avg_dps
 
 
+def timeline_table(timeline: TimelineResult) -> Table:
+    """Returns a table of the mean DPS and aura uptimes per bucket."""
+    table = Table(title="DPS Timeline", box=box.SIMPLE)
+    table.add_column("Time", style="blue", justify="right")
+    table.add_column("DPS", style="yellow", justify="right", no_wrap=True)
+
+    auras = timeline.auras
+    uptimes = [timeline.uptime(aura) for aura in auras]
+    for aura in auras:
+        table.add_column(aura, style="dark_green", justify="right")
+
+    # A single iteration has no error to show.
+    if timeline.dps.count < 2:
+        dps_error = ["n/a"] * timeline.bucket_count
+    else:
+        dps_error = [
+            f"{CONFIDENCE_Z * error:.2f}"
+            for error in timeline.dps.standard_error
+        ]
+    for bucket in range(timeline.bucket_count):
+        start = bucket * timeline.bucket_width
+        table.add_row(
+            f"{start:g}-{start + timeline.bucket_spans[bucket]:g}s",
+            f"[bold magenta]{timeline.dps.mean[bucket]:.2f}[/bold magenta] "
+            + f"± {dps_error[bucket]}",
+            *(f"{uptime[bucket]:.0%}" for uptime in uptimes),
+        )
+
+    return table
+
+
+def stat_weights(
+    table: Table,
+    configuration: SimFellConfiguration,
+    gain: float,
+    workers: int = 1,
+) -> None:
+    """Runs the configuration with each stat increased by the gain and adds
+    the DPS gained per stat point to the table."""
+
+    # Baseline plus one variant per stat, all over the same iterations.
+    total = configuration.run_count * (len(STAT_WEIGHT_STATS) + 1)
+
+    with Progress(
+        TextColumn(
+            "[bold]Calculating Stat Weights[/bold] "
+            + "[progress.percentage]{task.percentage:>3.0f}%"
+        ),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TextColumn("•"),
+        TimeElapsedColumn(),
+        TextColumn("•"),
+        TimeRemainingColumn(),
+    ) as progress:
+        task = progress.add_task("Stat Weights", total=total)
+
+        baseline_dps, weights = run_stat_weights(
+            configuration,
+            configuration.run_count,
+            gain,
+            workers=workers,
+            on_progress=lambda advance: progress.update(task, advance=advance),
+        )
+
+    table.add_row(
+        "Average DPS", f"[bold magenta]{baseline_dps:.2f}", end_section=True
+    )
+
+    # Normalized so the main stat is worth 1.
+    main_stat_weight = next(
+        (weight.weight for weight in weights if weight.stat == "intellect"),
+        0,
+    )
+
+    for weight in sorted(weights, key=lambda w: w.weight, reverse=True):
+        normalized = (
+            f" ({weight.weight / main_stat_weight:.2f})"
+            if main_stat_weight
+            else ""
+        )
+        table.add_row(
+            f"{weight.stat.capitalize()} (+{gain:g})",
+            f"[bold magenta]{weight.weight:.3f} ± {weight.error:.3f}"
+            + f"[/bold magenta] DPS/pt{normalized}",
+        )
+
+
+def talent_sweep(
+    table: Table,
+    configuration: SimFellConfiguration,
+    picks_per_row: int,
+    talent_filter: Optional[str] = None,
+    workers: int = 1,
+    race_top: Optional[int] = None,
+    extra_tables: Optional[List[Table]] = None,
+) -> None:
+    """Runs the configuration with every talent build of its hero, or those
+    matching the filter, and adds the builds ranked by DPS to the extra
+    tables. With race_top, builds clearly behind the best race_top are
+    dropped early."""
+
+    builds = configuration.character.talent_tree.builds(picks_per_row)
+    if talent_filter:
+        builds = [build for build in builds if re.search(talent_filter, build)]
+    if not builds:
+        raise ValueError("No talent build matches the talent filter.")
+
+    groups = group_talent_builds(configuration, builds)
+
+    with Progress(
+        TextColumn(
+            "[bold]Sweeping Talent Builds[/bold] "
+            + "[progress.percentage]{task.percentage:>3.0f}%"
+        ),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TextColumn("•"),
+        TimeElapsedColumn(),
+        TextColumn("•"),
+        TimeRemainingColumn(),
+    ) as progress:
+        task = progress.add_task(
+            "Talent Sweep", total=configuration.run_count * len(groups)
+        )
+
+        results = run_talent_sweep(
+            configuration,
+            groups,
+            configuration.run_count,
+            workers=workers,
+            on_progress=lambda advance: progress.update(task, advance=advance),
+            race_top=race_top,
+        )
+        # A race usually ends before spending every iteration.
+        progress.update(task, total=progress.tasks[task].completed)
+
+    table.add_row("Talent Builds", f"{len(groups)} simulated of {len(builds)}")
+    table.add_row(
+        "Best Build",
+        f"[bold magenta]{results[0].talents} ({results[0].dps:.2f} DPS)",
+        end_section=True,
+    )
+
+    builds_table = Table(title="Talent Builds", box=box.SIMPLE)
+    builds_table.add_column("Rank", style="blue", justify="right")
+    builds_table.add_column("Build", style="yellow")
+    builds_table.add_column("DPS", style="magenta", justify="right")
+    builds_table.add_column("vs Best", style="magenta", justify="right")
+    builds_table.add_column("Runs", style="grey70", justify="right")
+    builds_table.add_column("Same As", style="grey70")
+
+    # Confidence intervals at the same level as the average DPS report.
+    for rank, result in enumerate(results, start=1):
+        builds_table.add_row(
+            str(rank),
+            result.talents,
+            f"{result.dps:.2f} ± {CONFIDENCE_Z * result.error:.2f}",
+            (
+                f"{result.delta:.2f} ± {CONFIDENCE_Z * result.delta_error:.2f}"
+                if rank > 1
+                else ""
+            ),
+            str(result.iterations),
+            ", ".join(result.equivalent),
+        )
+
+    if extra_tables is not None:
+        extra_tables.append(builds_table)
+
+
+def simulate_profilesets(
+    description: str,
+    configuration: SimFellConfiguration,
+    named_configurations: Iterable[Tuple[str, SimFellConfiguration]],
+    count: int,
+    workers: int = 1,
+    race_top: Optional[int] = None,
+) -> Tuple[float, List[ProfilesetResult]]:
+    """Runs the configuration and the count named configurations with a
+    progress bar, and returns the configuration's DPS and their results."""
+
+    with Progress(
+        TextColumn(
+            f"[bold]{description}[/bold] "
+            + "[progress.percentage]{task.percentage:>3.0f}%"
+        ),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TextColumn("•"),
+        TimeElapsedColumn(),
+        TextColumn("•"),
+        TimeRemainingColumn(),
+    ) as progress:
+        # The baseline plus each profileset, all over the same iterations.
+        task = progress.add_task(
+            description, total=configuration.run_count * (count + 1)
+        )
+
+        baseline_dps, results = run_profilesets(
+            configuration,
+            named_configurations,
+            configuration.run_count,
+            workers=workers,
+            on_progress=lambda advance: progress.update(task, advance=advance),
+            race_top=race_top,
+        )
+        progress.update(task, total=progress.tasks[task].completed)
+
+    return baseline_dps, results
+
+
+def profilesets_table(
+    title: str,
+    name: str,
+    baseline: str,
+    results: List[ProfilesetResult],
+    ties: Optional[Dict[str, List[str]]] = None,
+) -> Table:
+    """Returns a table of the profileset results, with the DPS difference
+    to the baseline, and the names tied with each if given."""
+
+    results_table = Table(title=title, box=box.SIMPLE)
+    results_table.add_column(name, style="yellow")
+    results_table.add_column("DPS", style="magenta", justify="right")
+    results_table.add_column(
+        f"vs {baseline}", style="magenta", justify="right"
+    )
+    results_table.add_column("Runs", style="grey70", justify="right")
+    if ties is not None:
+        results_table.add_column("Ties", style="grey70")
+
+    for result in results:
+        row = [
+            result.name,
+            f"{result.dps:.2f} ± {CONFIDENCE_Z * result.error:.2f}",
+            f"{result.delta:+.2f} ± {CONFIDENCE_Z * result.delta_error:.2f}",
+            str(result.iterations),
+        ]
+        if ties is not None:
+            row.append(", ".join(ties[result.name]))
+        results_table.add_row(*row)
+
+    return results_table
+
+
+def profilesets(
+    table: Table,
+    configuration: SimFellConfiguration,
+    simfile_parser: SimFileParser,
+    workers: int = 1,
+    race_top: Optional[int] = None,
+    extra_tables: Optional[List[Table]] = None,
+) -> None:
+    """Runs the configuration and each profileset of the SimFell file, and
+    adds the profilesets sorted by their DPS difference to the extra
+    tables. With race_top, profilesets clearly behind the best race_top are
+    dropped early."""
+
+    count = simfile_parser.count_profilesets()
+    if not count:
+        raise ValueError("The SimFell file has no profilesets.")
+
+    baseline_dps, results = simulate_profilesets(
+        "Simulating Profilesets",
+        configuration,
+        simfile_parser.profilesets(configuration),
+        count,
+        workers=workers,
+        race_top=race_top,
+    )
+
+    table.add_row("Average DPS", f"[bold magenta]{baseline_dps:.2f}")
+    table.add_row("Profilesets", str(count), end_section=True)
+
+    if extra_tables is not None:
+        extra_tables.append(
+            profilesets_table("Profilesets", "Profileset", "Baseline", results)
+        )
+
+
+def top_gear(
+    table: Table,
+    configuration: SimFellConfiguration,
+    workers: int = 1,
+    race_top: Optional[int] = None,
+    extra_tables: Optional[List[Table]] = None,
+) -> None:
+    """Runs the configuration and each combination of its candidate gear
+    left after pruning, and adds the combinations sorted by their DPS
+    difference to the equipped gear to the extra tables. Combinations that
+    would simulate identically are run once and listed as ties."""
+
+    combinations, gear_profilesets, ties = top_gear_profilesets(configuration)
+    if not combinations:
+        raise ValueError("The SimFell file has no candidate gear.")
+
+    baseline_dps, results = simulate_profilesets(
+        "Simulating Top Gear",
+        configuration,
+        gear_profilesets,
+        len(gear_profilesets),
+        workers=workers,
+        race_top=race_top,
+    )
+
+    table.add_row("Average DPS", f"[bold magenta]{baseline_dps:.2f}")
+    table.add_row(
+        "Gear Combinations",
+        f"{len(gear_profilesets)} simulated, "
+        f"{sum(map(len, ties.values()))} tied, of {combinations}",
+        end_section=True,
+    )
+
+    if extra_tables is not None:
+        extra_tables.append(
+            profilesets_table("Top Gear", "Gear", "Equipped", results, ties)
+        )
+
+
 if __name__ == "__main__":
     # Create parser for command line arguments.
     parser = argparse.ArgumentParser(description="Simulate DPS.")
@@ -303,7 +771,14 @@ if __name__ == "__main__":
         type=str,
         default="average_dps",
         help="Type of simulation to run.",
-        choices=["average_dps", "stat_weights", "debug_sim"],
+        choices=[
+            "average_dps",
+            "stat_weights",
+            "talent_sweep",
+            "profilesets",
+            "top_gear",
+            "debug_sim",
+        ],
         required=True,
     )
     parser.add_argument(
@@ -348,6 +823,20 @@ if __name__ == "__main__":
         type=int,
         help="Number of runs to average DPS.",
     )
+    parser.add_argument(
+        "-te",
+        "--target-error",
+        type=float,
+        help="Stop once the standard error of the mean DPS is below this. "
+        + "The run count becomes the maximum number of runs.",
+    )
+    parser.add_argument(
+        "-tl",
+        "--timeline",
+        type=float,
+        help="Record the DPS and buff uptime over time in buckets of this "
+        + "many seconds and print them after the results.",
+    )
     parser.add_argument(
         "-g",
         "--stat-weights-gain",
@@ -355,12 +844,63 @@ if __name__ == "__main__":
         default=20,
         help="Gain of stat weights for the simulation.",
     )
+    parser.add_argument(
+        "--talent-picks",
+        type=int,
+        default=1,
+        help="Talents picked in each row by the builds of talent_sweep.",
+    )
+    parser.add_argument(
+        "--talent-filter",
+        type=str,
+        help="Only sweep the talent builds matching this regular "
+        + "expression, e.g. '^2-' for builds with Talent 2.1 alone in row 1.",
+    )
+    parser.add_argument(
+        "-k",
+        "--race-top",
+        type=int,
+        help="Race the builds of talent_sweep, the profilesets or the "
+        + "top_gear combinations: drop those clearly behind the best this "
+        + "many and give their runs to the others.",
+    )
     parser.add_argument(
         "-x",
         "--experimental-feature",
         action="store_true",
         help="Enable experimental features such as the damage table.",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes to split the runs across. "
+        + "0 uses every available core.",
+    )
+    parser.add_argument(
+        "-l",
+        "--log-file",
+        type=str,
+        help="File to also write the debug_sim event log to, or for other "
+        + "simulation types the last events before a run that fails. "
+        + "Files ending in .jsonl get one JSON event per line.",
+    )
+    parser.add_argument(
+        "-p",
+        "--profile",
+        type=int,
+        nargs="?",
+        const=100,
+        help="Profile this many runs (100 if not given) of the simulation "
+        + "in a single process and print the hot functions.",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=str,
+        default="profile",
+        help="Path prefix of the .pstats and .speedscope.json profiles.",
+    )
     parser.add_argument(
         "-f",
         "--simfile",
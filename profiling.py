@@ -0,0 +1,202 @@
+"""Module for profiling simulations."""
+
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+
+from rich import box
+from rich.table import Table
+
+# Root of the repository, to group profiled functions by subsystem.
+REPOSITORY_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Seconds between stack samples of the speedscope profile.
+SAMPLE_INTERVAL = 0.001
+
+# A frame of the speedscope profile: file, line and function name.
+FrameKey = Tuple[str, int, str]
+
+
+def subsystem(filename: str) -> str:
+    """Returns the subsystem of a source file, e.g. 'base/spells' or
+    'characters/rime'. Built-ins and libraries are 'external'."""
+    if not os.path.isabs(filename):
+        return "external"
+
+    path = os.path.normpath(filename)
+    if not path.startswith(REPOSITORY_ROOT + os.sep):
+        return "external"
+
+    parts = os.path.relpath(path, REPOSITORY_ROOT).split(os.sep)
+    if len(parts) == 1:
+        return parts[0]
+    if parts[0] in ("characters", "base") and len(parts) > 2:
+        return f"{parts[0]}/{parts[1]}"
+    return parts[0]
+
+
+class StackSampler:
+    """Class sampling the call stack of a thread at a fixed interval, for
+    flame graphs. cProfile only keeps callers one level up."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.frames: Dict[FrameKey, int] = {}
+        self.samples: List[List[int]] = []
+        self.weights: List[float] = []
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, daemon=True)
+        self._switch_interval = sys.getswitchinterval()
+
+    def start(self) -> None:
+        """Starts sampling the calling thread."""
+        # The sampler needs the GIL to take a sample, so hand it over often.
+        sys.setswitchinterval(self.interval / 2)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        """Stops sampling."""
+        self._stop.set()
+        self._sampler.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def _frame_index(self, key: FrameKey) -> int:
+        index = self.frames.get(key)
+        if index is None:
+            index = self.frames[key] = len(self.frames)
+        return index
+
+    def _run(self) -> None:
+        last_sample = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(  # pylint: disable=W0212
+                self._thread_id
+            )
+            now = time.perf_counter()
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    self._frame_index(
+                        (code.co_filename, code.co_firstlineno, code.co_name)
+                    )
+                )
+                frame = frame.f_back
+
+            if stack:
+                stack.reverse()
+                self.samples.append(stack)
+                self.weights.append(now - last_sample)
+            last_sample = now
+
+    def to_speedscope(self, name: str) -> Dict[str, Any]:
+        """Returns the samples in speedscope's file format."""
+        frames = [
+            {
+                "name": f"{function} ({subsystem(filename)})",
+                "file": filename,
+                "line": line,
+            }
+            for (filename, line, function) in self.frames
+        ]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(self.weights),
+                    "samples": self.samples,
+                    "weights": self.weights,
+                }
+            ],
+            "name": name,
+            "activeProfileIndex": 0,
+            "exporter": "Fellowship-Rime-Simc",
+        }
+
+
+def profile(
+    function: Callable[[], Any], output_prefix: str
+) -> Tuple[Any, pstats.Stats]:
+    """Runs the function under cProfile and the stack sampler. Writes
+    '<prefix>.pstats' and '<prefix>.speedscope.json', and returns the
+    function's result and the stats."""
+    profiler = cProfile.Profile()
+    sampler = StackSampler()
+
+    sampler.start()
+    profiler.enable()
+    try:
+        result = function()
+    finally:
+        profiler.disable()
+        sampler.stop()
+
+    profiler.dump_stats(f"{output_prefix}.pstats")
+    with open(
+        f"{output_prefix}.speedscope.json", "w", encoding="utf-8"
+    ) as file:
+        json.dump(sampler.to_speedscope(os.path.basename(output_prefix)), file)
+
+    return result, pstats.Stats(profiler)
+
+
+def hot_functions_table(stats: pstats.Stats, limit: int = 5) -> Table:
+    """Returns a table of the functions with the most own time, grouped by
+    subsystem and sorted by each subsystem's total."""
+    grouped: Dict[str, List[Tuple[float, int, str]]] = defaultdict(list)
+
+    # pylint: disable=no-member
+    for (filename, line, function), values in stats.stats.items():
+        _, calls, own_time, _, _ = values
+        grouped[subsystem(filename)].append(
+            (
+                own_time,
+                calls,
+                f"{function} ({os.path.basename(filename)}:{line})",
+            )
+        )
+
+    total_time = stats.total_tt or 1  # pylint: disable=no-member
+
+    table = Table(title="Hot Functions", box=box.SIMPLE)
+    table.add_column("Subsystem", style="blue", vertical="middle")
+    table.add_column("Function", style="yellow")
+    table.add_column("Own Time", style="magenta", justify="right")
+    table.add_column("Calls", style="grey70", justify="right")
+
+    for name, functions in sorted(
+        grouped.items(),
+        key=lambda item: sum(own for own, _, _ in item[1]),
+        reverse=True,
+    ):
+        functions.sort(reverse=True)
+        subsystem_time = sum(own for own, _, _ in functions)
+        table.add_row(
+            f"[bold]{name}",
+            "[bold]Total",
+            f"[bold]{subsystem_time:.3f}s ({subsystem_time / total_time:.0%})",
+            "",
+        )
+        for own_time, calls, function in functions[:limit]:
+            table.add_row(
+                "",
+                function,
+                f"{own_time:.3f}s ({own_time / total_time:.0%})",
+                str(calls),
+            )
+        table.add_section()
+
+    return table
@@ -0,0 +1,632 @@
+"""Module for running batches of Simulations, optionally across processes."""
+
+import math
+import os
+from itertools import islice
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from simfell_parser.model import SimFellConfiguration
+from sim import Simulation
+from damage_breakdown import DamageBreakdown
+from timeline import TimelineResult
+from streaming_stats import CONFIDENCE_Z, StreamingStatistics
+
+# Smallest number of iterations sent to a worker at once. Anything smaller
+# spends more time pickling results than simulating.
+MINIMUM_CHUNK_SIZE = 25
+
+# Chunks queued per worker. Workers pull the next chunk as soon as they
+# finish one, so a slow chunk never holds the others up.
+CHUNKS_PER_WORKER = 4
+
+# Iterations run between checks of the standard error, and before the first.
+# Fewer than this gives too rough an estimate of the variance to stop on.
+ERROR_CHECK_INTERVAL = 100
+
+# Share of the iterations every candidate of a race runs before the first
+# are dropped, and the fewest it runs unless that leaves no second round.
+RACE_FIRST_ROUND_SHARE = 0.1
+RACE_MINIMUM_FIRST_ROUND = 20
+
+# Profilesets simulated per process pool. Only this many are parsed and
+# held at once, however many the SimFell file has.
+PROFILESET_BATCH_SIZE = 32
+
+
+@dataclass
+class BatchResult:
+    """Class for the merged results of a batch of iterations."""
+
+    dps: StreamingStatistics = field(default_factory=StreamingStatistics)
+    breakdown: DamageBreakdown = field(default_factory=DamageBreakdown)
+    timeline: Optional[TimelineResult] = None
+
+    @property
+    def iterations(self) -> int:
+        """Returns the number of iterations run."""
+        return self.dps.count
+
+    @property
+    def average_dps(self) -> float:
+        """Returns the mean DPS over all iterations."""
+        return self.dps.mean
+
+    @property
+    def standard_error(self) -> float:
+        """Returns the standard error of the mean DPS."""
+        return self.dps.standard_error
+
+    def reached_error(self, target_error: float) -> bool:
+        """Returns True once enough iterations ran for the standard error
+        to be below the target."""
+        return (
+            self.iterations >= ERROR_CHECK_INTERVAL
+            and self.standard_error <= target_error
+        )
+
+    def add(self, simulation: Simulation, dps: float) -> None:
+        """Adds the result of a single finished simulation."""
+        self.dps.add(dps)
+        self.breakdown.add(simulation.spell_counters, simulation.damage)
+
+        if simulation.timeline is not None:
+            if self.timeline is None:
+                self.timeline = TimelineResult(
+                    simulation.timeline.duration,
+                    simulation.timeline.bucket_width,
+                )
+            self.timeline.add(simulation.timeline)
+
+    def merge(self, other: "BatchResult") -> None:
+        """Merges the results of another batch into this one."""
+        self.dps.merge(other.dps)
+        self.breakdown.merge(other.breakdown)
+
+        if other.timeline is not None:
+            if self.timeline is None:
+                self.timeline = TimelineResult(
+                    other.timeline.duration, other.timeline.bucket_width
+                )
+            self.timeline.merge(other.timeline)
+
+
+def run_batch(simulation: Simulation, iterations: int) -> BatchResult:
+    """Runs the given number of iterations of the simulation."""
+    result = BatchResult()
+
+    for _ in range(iterations):
+        dps = simulation.run()
+        result.add(simulation, dps)
+
+    return result
+
+
+def run_seeded(
+    simulation: Simulation, first_seed: int, iterations: int
+) -> List[float]:
+    """Runs the iterations of the simulation with consecutive seeds and
+    returns the DPS of each."""
+    return [simulation.run(seed=first_seed + i) for i in range(iterations)]
+
+
+# Configurations shipped to each worker process once, by the pool
+# initializer, and the Simulations the worker built from them.
+_worker_configurations: Dict[str, SimFellConfiguration] = {}
+_worker_simulations: Dict[str, Simulation] = {}
+
+
+def _init_worker(configurations: Dict[str, SimFellConfiguration]) -> None:
+    """Stores the configurations for the worker's batches."""
+    _worker_configurations.clear()
+    _worker_configurations.update(configurations)
+    _worker_simulations.clear()
+
+
+def _worker_simulation(name: str) -> Simulation:
+    """Returns the worker's Simulation for the named configuration."""
+    if name not in _worker_simulations:
+        _worker_simulations[name] = Simulation(_worker_configurations[name])
+    return _worker_simulations[name]
+
+
+def _run_worker_batch(name: str, iterations: int) -> BatchResult:
+    """Runs a chunk of iterations inside a worker process."""
+    return run_batch(_worker_simulation(name), iterations)
+
+
+def _run_worker_seeded(
+    name: str, first_seed: int, iterations: int
+) -> List[float]:
+    """Runs a chunk of seeded iterations inside a worker process."""
+    return run_seeded(_worker_simulation(name), first_seed, iterations)
+
+
+def resolve_worker_count(workers: int) -> int:
+    """Returns the number of worker processes to use. Zero means one
+    per available core."""
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def chunk_sizes(iterations: int, workers: int) -> List[int]:
+    """Splits the iterations into chunks for the worker processes."""
+    chunk_size = max(
+        MINIMUM_CHUNK_SIZE,
+        math.ceil(iterations / (workers * CHUNKS_PER_WORKER)),
+    )
+    full_chunks, remainder = divmod(iterations, chunk_size)
+
+    return [chunk_size] * full_chunks + ([remainder] if remainder else [])
+
+
+def run_iterations(
+    configuration: SimFellConfiguration,
+    iterations: int,
+    workers: int = 1,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> BatchResult:
+    """Runs the iterations, across worker processes if more than one
+    worker is requested, and returns the merged results."""
+    workers = resolve_worker_count(workers)
+    result = BatchResult()
+
+    if workers == 1:
+        simulation = Simulation(configuration)
+        for _ in range(iterations):
+            result.add(simulation, simulation.run())
+            if on_progress:
+                on_progress(1)
+        return result
+
+    chunks = chunk_sizes(iterations, workers)
+    if not chunks:
+        return result
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)),
+        initializer=_init_worker,
+        initargs=({"": configuration},),
+    ) as executor:
+        futures = [
+            executor.submit(_run_worker_batch, "", chunk) for chunk in chunks
+        ]
+        for future in as_completed(futures):
+            chunk_result = future.result()
+            result.merge(chunk_result)
+            if on_progress:
+                on_progress(chunk_result.iterations)
+
+    return result
+
+
+def run_to_target_error(
+    configuration: SimFellConfiguration,
+    target_error: float,
+    max_iterations: int,
+    workers: int = 1,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> BatchResult:
+    """Runs iterations in batches until the standard error of the mean DPS
+    is below the target or the maximum iterations ran, and returns the
+    merged results."""
+    workers = resolve_worker_count(workers)
+    result = BatchResult()
+
+    if workers == 1:
+        simulation = Simulation(configuration)
+        while result.iterations < max_iterations:
+            result.add(simulation, simulation.run())
+            if on_progress:
+                on_progress(1)
+            if (
+                result.iterations % ERROR_CHECK_INTERVAL == 0
+                and result.reached_error(target_error)
+            ):
+                break
+        return result
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=({"": configuration},),
+    ) as executor:
+        pending = set()
+        submitted = 0
+
+        while True:
+            # Keep every worker busy until the target is reached. Batches
+            # already running when it is are still merged in.
+            while (
+                len(pending) < workers
+                and submitted < max_iterations
+                and not result.reached_error(target_error)
+            ):
+                batch = min(ERROR_CHECK_INTERVAL, max_iterations - submitted)
+                pending.add(executor.submit(_run_worker_batch, "", batch))
+                submitted += batch
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch_result = future.result()
+                result.merge(batch_result)
+                if on_progress:
+                    on_progress(batch_result.iterations)
+
+    return result
+
+
+def run_common_random_numbers(
+    configurations: Dict[str, SimFellConfiguration],
+    iterations: int,
+    workers: int = 1,
+    on_progress: Optional[Callable[[int], None]] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """Runs every configuration over the same seeded iterations and returns
+    the DPS of each iteration per configuration.
+
+    Iteration i of every configuration rolls the same random streams, so
+    differences between configurations are not drowned out by luck.
+    """
+    workers = resolve_worker_count(workers)
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    results = {name: np.empty(iterations) for name in configurations}
+
+    if workers == 1:
+        for name, configuration in configurations.items():
+            simulation = Simulation(configuration)
+            for i in range(iterations):
+                results[name][i] = simulation.run(seed=seed + i)
+                if on_progress:
+                    on_progress(1)
+        return results
+
+    chunks = chunk_sizes(iterations, workers)
+    offsets = [sum(chunks[:index]) for index in range(len(chunks))]
+    if not chunks or not configurations:
+        return results
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks) * len(configurations)),
+        initializer=_init_worker,
+        initargs=(configurations,),
+    ) as executor:
+        # Chunks are queued variant by variant within each seed range, so
+        # every variant progresses at the same pace.
+        futures = {}
+        for offset, chunk in zip(offsets, chunks):
+            for name in configurations:
+                future = executor.submit(
+                    _run_worker_seeded, name, seed + offset, chunk
+                )
+                futures[future] = (name, offset)
+        for future in as_completed(futures):
+            name, offset = futures[future]
+            dps = future.result()
+            results[name][offset : offset + len(dps)] = dps
+            if on_progress:
+                on_progress(len(dps))
+
+    return results
+
+
+def standard_error(values: np.ndarray) -> float:
+    """Returns the standard error of the mean of the values."""
+    if len(values) < 2:
+        return 0.0
+    return float(values.std(ddof=1) / math.sqrt(len(values)))
+
+
+def race_first_round(iterations: int) -> int:
+    """Returns the iterations every candidate of a race runs before the
+    first are dropped, leaving enough of the given iterations for at least
+    one more round."""
+    return max(
+        int(iterations * RACE_FIRST_ROUND_SHARE),
+        min(RACE_MINIMUM_FIRST_ROUND, iterations // 2),
+        1,
+    )
+
+
+def run_race(
+    configurations: Dict[str, SimFellConfiguration],
+    iterations: int,
+    keep: int = 1,
+    workers: int = 1,
+    on_progress: Optional[Callable[[int], None]] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """Races the configurations by successive halving and returns the DPS of
+    each iteration each of them ran.
+
+    Every configuration runs a first round of iterations. After each round,
+    those clearly behind the keep-th best, by the confidence interval of
+    their paired difference, are dropped and the others run as many
+    iterations again. The race ends once the iterations of running every
+    configuration the given times are spent, the last round running what
+    is left, so the configurations still in the race run more than that.
+    """
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    if len(configurations) <= keep:
+        return run_common_random_numbers(
+            configurations, iterations, workers, on_progress, seed
+        )
+
+    budget = iterations * len(configurations)
+    results = {name: np.empty(0) for name in configurations}
+    racing = list(configurations)
+    # Iterations run by every configuration still in the race. Iteration i
+    # always uses seed + i, so they all share random numbers.
+    completed = 0
+    target = race_first_round(iterations)
+
+    while True:
+        round_iterations = min(target - completed, budget // len(racing))
+        if round_iterations <= 0:
+            break
+
+        dps = run_common_random_numbers(
+            {name: configurations[name] for name in racing},
+            round_iterations,
+            workers,
+            on_progress,
+            seed + completed,
+        )
+        for name, round_dps in dps.items():
+            results[name] = np.concatenate((results[name], round_dps))
+        budget -= round_iterations * len(racing)
+        completed += round_iterations
+
+        # Drop those whose whole confidence interval of the difference to
+        # the keep-th best is below zero.
+        racing.sort(key=lambda name: results[name].mean(), reverse=True)
+        threshold = results[racing[keep - 1]]
+        for name in racing[keep:]:
+            deltas = results[name] - threshold
+            if deltas.mean() + CONFIDENCE_Z * standard_error(deltas) < 0:
+                racing.remove(name)
+        target = completed * 2
+
+    return results
+
+
+def _rank_key(dps: np.ndarray) -> Tuple[int, float]:
+    """Returns the sort key ranking configurations still in a race, which
+    ran the most iterations, above those dropped, then by mean DPS."""
+    return len(dps), float(dps.mean())
+
+
+@dataclass
+class StatWeight:
+    """Class for the DPS gained per point of a stat."""
+
+    stat: str
+    dps: float
+    weight: float
+    error: float
+
+
+# Stats simulated by stat weights, named as in the SimFell configuration.
+STAT_WEIGHT_STATS = ("intellect", "crit", "expertise", "haste", "spirit")
+
+
+def run_stat_weights(
+    configuration: SimFellConfiguration,
+    iterations: int,
+    gain: float,
+    workers: int = 1,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> Tuple[float, List[StatWeight]]:
+    """Simulates the configuration and one variant per stat with the gain
+    added, and returns the baseline DPS and the DPS per point of each stat.
+
+    The gain goes through the character's diminishing returns like any other
+    stat points. All variants share random numbers with the baseline, so the
+    error is that of the paired per-iteration differences.
+    """
+    configurations = {"baseline": configuration}
+    for stat in STAT_WEIGHT_STATS:
+        configurations[stat] = configuration.with_changes(
+            **{stat: getattr(configuration, stat) + gain}
+        )
+
+    dps = run_common_random_numbers(
+        configurations, iterations, workers=workers, on_progress=on_progress
+    )
+    baseline = dps.pop("baseline")
+
+    weights = []
+    for stat, stat_dps in dps.items():
+        deltas = (stat_dps - baseline) / gain
+        weights.append(
+            StatWeight(
+                stat=stat,
+                dps=float(stat_dps.mean()),
+                weight=float(deltas.mean()),
+                error=standard_error(deltas),
+            )
+        )
+
+    return float(baseline.mean()), weights
+
+
+@dataclass
+class TalentBuildResult:
+    """Class for the DPS of a talent build in a talent sweep, and its
+    difference to the best build."""
+
+    talents: str
+    dps: float
+    error: float
+    delta: float
+    delta_error: float
+    iterations: int
+    equivalent: List[str] = field(default_factory=list)
+
+
+def group_talent_builds(
+    configuration: SimFellConfiguration, builds: List[str]
+) -> Dict[str, List[str]]:
+    """Groups the talent builds only differing in talents the hero declares
+    inert. Returns the first build of each group and the others in it."""
+    groups: Dict[str, List[str]] = {}
+    first_builds: Dict[int, str] = {}
+    for build in builds:
+        character = configuration.with_changes(talents=build).character
+        first_build = first_builds.setdefault(
+            character.simulated_talent_mask, build
+        )
+        if first_build == build:
+            groups[build] = []
+        else:
+            groups[first_build].append(build)
+    return groups
+
+
+def run_talent_sweep(
+    configuration: SimFellConfiguration,
+    builds: Dict[str, List[str]],
+    iterations: int,
+    workers: int = 1,
+    on_progress: Optional[Callable[[int], None]] = None,
+    race_top: Optional[int] = None,
+) -> List[TalentBuildResult]:
+    """Simulates the configuration with each talent build, as grouped by
+    group_talent_builds, and returns the builds from best to worst.
+
+    All builds share random numbers, so the differences to the best build
+    are paired, over the iterations both ran. With race_top, the builds
+    are raced until only the best race_top are left.
+    """
+    configurations = {
+        build: configuration.with_changes(talents=build) for build in builds
+    }
+    if race_top:
+        dps = run_race(
+            configurations, iterations, race_top, workers, on_progress
+        )
+    else:
+        dps = run_common_random_numbers(
+            configurations, iterations, workers, on_progress
+        )
+    best = max(dps.values(), key=_rank_key)
+
+    results = []
+    for build, build_dps in sorted(
+        dps.items(), key=lambda item: _rank_key(item[1]), reverse=True
+    ):
+        deltas = build_dps - best[: len(build_dps)]
+        results.append(
+            TalentBuildResult(
+                talents=build,
+                dps=float(build_dps.mean()),
+                error=standard_error(build_dps),
+                delta=float(deltas.mean()),
+                delta_error=standard_error(deltas),
+                iterations=len(build_dps),
+                equivalent=builds[build],
+            )
+        )
+    return results
+
+
+@dataclass
+class ProfilesetResult:
+    """Class for the DPS of a profileset and its difference to the
+    baseline."""
+
+    name: str
+    dps: float
+    error: float
+    delta: float
+    delta_error: float
+    iterations: int
+
+
+def _profileset_result(
+    name: str, dps: np.ndarray, baseline_dps: np.ndarray
+) -> ProfilesetResult:
+    """Returns the result of a profileset, compared to the baseline over
+    the iterations the profileset ran."""
+    deltas = dps - baseline_dps[: len(dps)]
+    return ProfilesetResult(
+        name=name,
+        dps=float(dps.mean()),
+        error=standard_error(dps),
+        delta=float(deltas.mean()),
+        delta_error=standard_error(deltas),
+        iterations=len(dps),
+    )
+
+
+def run_profilesets(
+    baseline: SimFellConfiguration,
+    profilesets: Iterable[Tuple[str, SimFellConfiguration]],
+    iterations: int,
+    workers: int = 1,
+    on_progress: Optional[Callable[[int], None]] = None,
+    race_top: Optional[int] = None,
+) -> Tuple[float, List[ProfilesetResult]]:
+    """Simulates the baseline and each named profileset, and returns the
+    baseline DPS and the profilesets from the largest DPS gain to the
+    largest loss.
+
+    Profilesets are taken from the iterable a batch at a time and run on the
+    baseline's random numbers, so only their results are kept. With
+    race_top, every profileset is taken at once and they are raced until
+    only the best race_top are left. The baseline then runs as many
+    iterations as the longest of them.
+    """
+    seed = np.random.SeedSequence().entropy
+
+    if race_top:
+        dps = run_race(
+            dict(profilesets), iterations, race_top, workers, on_progress, seed
+        )
+        baseline_dps = run_common_random_numbers(
+            {"baseline": baseline},
+            max((len(values) for values in dps.values()), default=iterations),
+            workers,
+            on_progress,
+            seed,
+        )["baseline"]
+        results = [
+            _profileset_result(name, values, baseline_dps)
+            for name, values in dps.items()
+        ]
+    else:
+        baseline_dps = run_common_random_numbers(
+            {"baseline": baseline}, iterations, workers, on_progress, seed
+        )["baseline"]
+        results = []
+        profilesets = iter(profilesets)
+        while batch := dict(islice(profilesets, PROFILESET_BATCH_SIZE)):
+            dps = run_common_random_numbers(
+                batch, iterations, workers, on_progress, seed
+            )
+            results.extend(
+                _profileset_result(name, values, baseline_dps)
+                for name, values in dps.items()
+            )
+
+    # Profilesets still in a race, which ran the most iterations, first.
+    results.sort(
+        key=lambda result: (result.iterations, result.delta), reverse=True
+    )
+    return float(baseline_dps.mean()), results
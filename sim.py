@@ -1,13 +1,51 @@
 """Module for the Simulation class."""
 
-from typing import Dict
+import heapq
+from itertools import count
+from typing import Callable, Dict, List, Optional, Tuple
 from copy import deepcopy
-from rich import print  # pylint: disable=redefined-builtin
 
+from base.clock import to_ms, to_seconds
 from base.spells.base_debuff import BaseDebuff
+from event_log import (
+    ActionCheckEvent,
+    CastEvent,
+    ConsoleSink,
+    EventLog,
+    FileSink,
+    GcdEvent,
+    IdleEvent,
+)
+from base.random_streams import SimulationRandom
+from damage_breakdown import SpellCounters
+from timeline import Timeline
 from simfell_parser.model import SimFellConfiguration
-from simfell_parser.condition_parser import SimFileConditionParser
-from simfell_parser.utils import SpellTypeT
+from simfell_parser.action_list import ActionListCompiler
+
+# Longest the clock moves at once while nothing can be cast, if any action
+# has conditions. Conditions can read values that change with the clock
+# alone, such as remaining times and cooldowns, and no event marks when
+# they turn true, so they are checked as often as the old fixed-step loop.
+IDLE_STEP_MS = 100
+
+# Seconds of events before a failed iteration written to the event log file.
+RECENT_EVENTS_SECONDS = 10
+
+
+class ScheduledEvent:
+    """Class for a callback scheduled at a fixed simulation time, in
+    milliseconds."""
+
+    __slots__ = ("time_ms", "callback", "cancelled")
+
+    def __init__(self, time_ms: int, callback: Callable[[], None]):
+        self.time_ms = time_ms
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Cancels the event so it is skipped when its time comes."""
+        self.cancelled = True
 
 
 class Simulation:
@@ -18,28 +56,106 @@ class Simulation:
         configuration: SimFellConfiguration,
         do_debug=False,
         is_deterministic=False,
+        seed: Optional[int] = None,
+        event_log: Optional[EventLog] = None,
     ):
-        """Initialize the Simulation."""
+        """Initialize the Simulation. Debug prints the event log to the
+        console unless another event log is given."""
 
         self.character = deepcopy(configuration.character)
         self.character.set_simulation(self)
         self.duration = configuration.duration
+        self.duration_ms = to_ms(configuration.duration)
         self.enemy_count = configuration.enemies
         self.do_debug = do_debug
         self.detailed_debug = False
-        self.time = 0
-        self.gcd = 0
+        # The clock, in whole milliseconds, and the same time in seconds
+        # for conditions and reports. Cooldowns, the GCD and auras store
+        # absolute timestamps on this clock, so advancing it touches
+        # nothing but the events that fire.
+        self.now_ms = 0
+        self.time = 0.0
+        self.gcd_end_ms = 0
         self.ability_queue = []
         self.debuffs: Dict[str, BaseDebuff] = {}
         self.damage = 0
-        self.damage_table = {}
+        self.spell_counters = SpellCounters()
+        self.timeline = (
+            Timeline(self.duration, configuration.timeline_bucket)
+            if configuration.timeline_bucket
+            else None
+        )
         self.is_deterministic = is_deterministic
 
+        # Every event site checks this for None and nothing else, so
+        # simulations without a log skip building the events entirely.
+        # With an event log file, the events of every run are kept in the
+        # ring buffer so a run that fails can write out its last ones.
+        if event_log is None and do_debug:
+            event_log = EventLog(sinks=[ConsoleSink()])
+        self.event_log_file = configuration.event_log_file
+        if event_log is None and self.event_log_file is not None:
+            event_log = EventLog()
+        self.event_log = event_log
+
+        # Every roll goes through this source. Without a seed it draws fresh
+        # entropy, so simulations in different processes never share rolls.
+        self.random = SimulationRandom(seed)
+
+        # Timed events (cast completes, aura ticks and expiries, cooldowns)
+        # ordered by time. The counter keeps events at the same time FIFO.
+        self._events: List[Tuple[int, int, ScheduledEvent]] = []
+        self._event_counter = count()
+
         self.configuration = configuration
 
         if self.is_deterministic:
             self.character._crit = 0
             self.character._spirit = 0
+            self.character.invalidate_stats()
+
+        # The character is copied once and reset between runs, so the same
+        # Simulation can be run repeatedly without rebuilding it.
+        self.character.capture_baseline()
+
+        # Resolved once, the action list is identical for every run.
+        self.action_list = ActionListCompiler.compile(
+            configuration.actions, self
+        )
+        for action in self.action_list:
+            action.spell.counter_slot = self.spell_counters.slot(
+                action.spell.name
+            )
+        self._polls_conditions = any(
+            action.action.condition for action in self.action_list
+        )
+
+    def reset(self) -> None:
+        """Resets the simulation and the character to the start of
+        the fight."""
+        self.now_ms = 0
+        self.time = 0.0
+        self.gcd_end_ms = 0
+        self.ability_queue = []
+        self.debuffs.clear()
+        self.damage = 0
+        self.spell_counters.clear()
+        if self.timeline is not None:
+            self.timeline.clear()
+        self._events.clear()
+        self._event_counter = count()
+        self.character.reset()
+        if self.event_log is not None:
+            self.event_log.clear()
+
+    @property
+    def gcd(self) -> float:
+        """Returns the remaining global cooldown in seconds."""
+        return to_seconds(self.gcd_end_ms - self.now_ms)
+
+    @gcd.setter
+    def gcd(self, value: float) -> None:
+        self.gcd_end_ms = self.now_ms + to_ms(value)
 
     def get_debuff(self, debuff_simfell_name: str) -> BaseDebuff:
         """Returns the Debuff."""
@@ -48,102 +164,117 @@ class Simulation:
 
         return None
 
+    def schedule(
+        self, time_ms: int, callback: Callable[[], None]
+    ) -> ScheduledEvent:
+        """Schedules the callback to run at the given time in
+        milliseconds."""
+        event = ScheduledEvent(time_ms, callback)
+        heapq.heappush(
+            self._events, (time_ms, next(self._event_counter), event)
+        )
+        return event
+
+    def next_event_time(self) -> float:
+        """Returns the time of the next pending event in milliseconds, or
+        infinity if there is none."""
+        events = self._events
+        while events and events[0][2].cancelled:
+            heapq.heappop(events)
+
+        return events[0][0] if events else float("inf")
+
+    def advance_to(self, time_ms: int) -> None:
+        """Moves the clock to the given time in milliseconds, firing every
+        event due on the way in order."""
+        events = self._events
+        while events and events[0][0] <= time_ms:
+            event = heapq.heappop(events)[2]
+            if event.cancelled:
+                continue
+
+            if event.time_ms > self.now_ms:
+                self.now_ms = event.time_ms
+                self.time = to_seconds(event.time_ms)
+            event.callback()
+
+        if time_ms > self.now_ms:
+            self.now_ms = time_ms
+            self.time = to_seconds(time_ms)
+
     def update_time(self, delta_time: float):
-        """Update the time of the simulation."""
-        delta_time = round(delta_time, 2)
-        self.time += delta_time
-        self.gcd -= delta_time
-
-        # Update spell cooldowns
-        for spell in self.character.spells.values():
-            spell.update_cooldown(delta_time)
-
-        # Update Players Buffs
-        for buff in list(self.character.buffs.values()):
-            if self.do_debug:
-                print(
-                    f"Time {self.time:.2f}: 🔄 Updating "
-                    + f"[dark_green]{buff.name} (Buff)[/dark_green] "
-                    + "remaining duration"
-                )
-
-            buff.update_remaining_duration(delta_time)
-
-        # Update Debuffs on an Enemy.
-        # TODO: In the future we will want to keep track of each enemy
-        # and each debuff. This will be important for Multi-Dotting
-        # in the future.
-
-        for debuff in list(self.debuffs.values()):
-            if self.do_debug:
-                print(
-                    f"Time {self.time:.2f}: 🔄 Updating "
-                    + f"[deep_pink4]{debuff.name} (Debuff)[/deep_pink4] "
-                    + "remaining duration"
-                )
-
-            debuff.update_remaining_duration(delta_time)
-
-    def run(self, detailed_debug=False):
-        """Run the simulation."""
+        """Advances the simulation by the delta time in seconds."""
+        self.advance_to(self.now_ms + to_ms(delta_time))
+
+    def write_recent_events(self, path: str) -> None:
+        """Writes the buffered events of the last seconds to the file. A
+        .jsonl file gets one JSON event per line."""
+        sink = FileSink(path, as_json=path.endswith(".jsonl"))
+        try:
+            self.event_log.dump(sink, since=self.time - RECENT_EVENTS_SECONDS)
+        finally:
+            sink.close()
+
+    def run(self, detailed_debug=False, seed: Optional[int] = None):
+        """Run the simulation. Runs given the same seed roll the same
+        random numbers."""
+        self.reset()
+        if seed is not None:
+            self.random.reseed(seed)
         self.detailed_debug = detailed_debug
+        event_log = self.event_log
+
+        try:
+            while self.now_ms <= self.duration_ms:
+                if self.gcd_end_ms > self.now_ms:
+                    if event_log is not None:
+                        event_log.record(GcdEvent(self.time, self.gcd))
+                    self.advance_to(self.gcd_end_ms)
+
+                for action in self.action_list:
+                    spell = action.spell
+
+                    if event_log is not None and self.detailed_debug:
+                        event_log.record(
+                            ActionCheckEvent(
+                                self.time,
+                                action.action.name,
+                                action.action.condition,
+                                action.check_conditions(),
+                                spell.is_ready(),
+                            )
+                        )
+
+                    if spell.is_ready() and action.check_conditions():
+                        self.spell_counters.casts[spell.counter_slot] += 1
+                        if event_log is not None:
+                            event_log.record(CastEvent(self.time, spell.name))
+                        spell.cast()
+                        break
+                else:
+                    # Without conditions, nothing can become castable until the
+                    # next event fires, so the clock jumps straight to it.
+                    next_event_time = self.next_event_time()
+                    if self._polls_conditions:
+                        next_event_time = min(
+                            next_event_time, self.now_ms + IDLE_STEP_MS
+                        )
+                    if next_event_time == float("inf"):
+                        # Nothing is left to happen, so the fight idles out.
+                        self.advance_to(self.duration_ms)
+                        break
 
-        while self.time <= self.duration:
-            if self.gcd > 0:
-                if self.do_debug:
-                    print(
-                        f"Time {self.time:.2f}: GCD: {self.gcd:.2f}"
-                        + " | [grey37]Updating time by GCD"
-                    )
-                self.update_time(self.gcd)
-
-            for action in self.configuration.actions:
-                if self.do_debug and self.detailed_debug:
-                    print(
-                        "[grey37]--------------------------[/grey37]"
-                        + f"\nAction: [dark_magenta]'{action.name}'"
-                        + "[/dark_magenta], Conditions: "
-                        + f"{len(action.conditions)}"
-                    )
-
-                spell: SpellTypeT = self.character.spells.get(
-                    action.name.split("/")[1], None
-                )
-                if not spell:
-                    print(
-                        f"Spell [cornflower_blue]'{action.name}'"
-                        + "[/cornflower_blue] not found in character spells"
-                    )
-                    continue
-
-                evaluate_conditions = (
-                    SimFileConditionParser.evaluate_conditions(
-                        action.conditions, self
-                    )
-                )
-
-                is_spell_ready = spell.is_ready()
-
-                if self.do_debug and self.detailed_debug:
-                    print(f"\tCondition Results: {evaluate_conditions}")
-                    print(f"\tSpell Ready: {is_spell_ready}")
-                    print("\t=====================\n")
-
-                if all([is_spell_ready, evaluate_conditions]):
-                    if self.do_debug:
-                        print(
-                            f"Time {self.time:.2f}: "
-                            + f"🔮 Casting [cornflower_blue]{spell.name}"
-                            + "[/cornflower_blue]"
+                    if event_log is not None:
+                        event_log.record(
+                            IdleEvent(self.time, to_seconds(next_event_time))
                         )
-                    spell.cast()
-                    break
-            else:
-                if self.do_debug:
-                    print(
-                        f"Time {self.time:.2f}: No Spell Ready"
-                        + " | [grey37]Updating time by 0.1"
-                    )
-                self.update_time(0.1)
+                    self.advance_to(next_event_time)
+        except Exception:
+            if self.event_log_file is not None:
+                self.write_recent_events(self.event_log_file)
+            raise
+
+        if self.timeline is not None:
+            self.timeline.finish(self.time)
 
         return self.damage / self.duration
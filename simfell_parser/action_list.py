@@ -0,0 +1,79 @@
+"""Module for compiling SimFell action lists."""
+
+import typing
+from typing import Callable, List
+
+from simfell_parser.model import Action
+from simfell_parser.condition_parser import SimFileConditionParser
+
+if typing.TYPE_CHECKING:
+    from base import BaseCharacter, BaseSpell
+    from sim import Simulation
+
+
+def _always_true() -> bool:
+    """Condition checker for actions without conditions."""
+    return True
+
+
+class CompiledAction:
+    """Class for an action resolved against a simulation's character."""
+
+    __slots__ = ("action", "spell", "check_conditions")
+
+    def __init__(
+        self,
+        action: Action,
+        spell: "BaseSpell",
+        check_conditions: Callable[[], bool],
+    ):
+        self.action = action
+        self.spell = spell
+        self.check_conditions = check_conditions
+
+
+class ActionListCompiler:
+    """Class for compiling SimFell action lists."""
+
+    @staticmethod
+    def validate(actions: List[Action], character: "BaseCharacter") -> None:
+        """Raises if any action refers to a spell the character
+        does not have."""
+        unknown = [
+            action.name
+            for action in actions
+            if action.spell_name not in character.spells
+        ]
+
+        if unknown:
+            raise ValueError(
+                f"Unknown spells in action list: {', '.join(unknown)}. "
+                + f"Available spells: {', '.join(character.spells)}"
+            )
+
+    @staticmethod
+    def compile(
+        actions: List[Action], simulation: "Simulation"
+    ) -> List[CompiledAction]:
+        """Resolves every action to the simulation's spell and a
+        condition checker."""
+        ActionListCompiler.validate(actions, simulation.character)
+
+        return [
+            CompiledAction(
+                action,
+                simulation.character.spells[action.spell_name],
+                ActionListCompiler.compile_conditions(action, simulation),
+            )
+            for action in actions
+        ]
+
+    @staticmethod
+    def compile_conditions(
+        action: Action, simulation: "Simulation"
+    ) -> Callable[[], bool]:
+        """Returns a callable checking the action's conditions."""
+        if not action.condition:
+            return _always_true
+
+        return SimFileConditionParser(action.condition).compile(simulation)
@@ -1,18 +1,21 @@
 """Module for parsing SimFell condition lines."""
 
 import typing
-from typing import Any, List
+from typing import Any, Callable, List, Tuple
 import operator
 import re
-from rich import print  # pylint: disable=redefined-builtin
-
-from simfell_parser.model import Condition
-
-# from simfell_parser.utils import CharacterTypeT
 
 if typing.TYPE_CHECKING:
     from sim import Simulation
 
+# A parsed condition. Nodes are tuples tagged by their first item:
+# ("value", constant), ("reference", path), ("not", node) and
+# ("operator", symbol, left, right).
+ConditionNode = Tuple[Any, ...]
+
+# Returns the current value of a node during a simulation.
+ConditionAccessor = Callable[[], Any]
+
 
 class SimFileConditionParser:
     """Class for parsing SimFell condition lines."""
@@ -34,192 +37,267 @@ class SimFileConditionParser:
         "xor": lambda x, y: bool(x) ^ bool(y),
     }
 
+    comparison_operators = ("==", "!=", ">", ">=", "<", "<=")
+
+    reference_prefixes = ("character.", "spell.", "buff.", "debuff.")
+
+    _token_pattern = re.compile(
+        r"\s*(?:(?P<number>\d+(?:\.\d+)?)"
+        + r"|(?P<name>[A-Za-z_][A-Za-z0-9_.]*)"
+        + r"|(?P<symbol>==|!=|>=|<=|[<>()+\-*/]))"
+    )
+
     def __init__(self, condition: str):
         self._condition = condition
+        self._tokens: List[str] = []
+        self._position = 0
+
+    def _tokenize(self) -> List[str]:
+        """Split the condition into tokens."""
+        tokens = []
+        position = 0
+        condition = self._condition.rstrip()
+
+        while position < len(condition):
+            match = self._token_pattern.match(condition, position)
+            if match is None or match.end() == position:
+                raise ValueError(
+                    f"Invalid condition: {self._condition} "
+                    + f"(unexpected '{condition[position:].strip()}')"
+                )
+            tokens.append(match.group(match.lastgroup))
+            position = match.end()
+
+        return tokens
+
+    def _peek(self) -> str:
+        """Returns the current token without consuming it."""
+        if self._position < len(self._tokens):
+            return self._tokens[self._position]
+        return ""
+
+    def _next(self) -> str:
+        """Consumes and returns the current token."""
+        token = self._peek()
+        if not token:
+            raise ValueError(
+                f"Invalid condition: {self._condition} (unexpected end)"
+            )
+        self._position += 1
+        return token
+
+    def _parse_binary(
+        self, symbols: Tuple[str, ...], parse_operand
+    ) -> ConditionNode:
+        """Parses a left-associative chain of the given operators."""
+        node = parse_operand()
+        while self._peek() in symbols:
+            symbol = self._next()
+            node = ("operator", symbol, node, parse_operand())
+        return node
+
+    def _parse_or(self) -> ConditionNode:
+        return self._parse_binary(("or",), self._parse_xor)
+
+    def _parse_xor(self) -> ConditionNode:
+        return self._parse_binary(("xor",), self._parse_and)
+
+    def _parse_and(self) -> ConditionNode:
+        return self._parse_binary(("and",), self._parse_not)
+
+    def _parse_not(self) -> ConditionNode:
+        if self._peek() == "not":
+            self._next()
+            return ("not", self._parse_not())
+        return self._parse_comparison()
+
+    def _parse_comparison(self) -> ConditionNode:
+        node = self._parse_sum()
+        if self._peek() in self.comparison_operators:
+            symbol = self._next()
+            node = ("operator", symbol, node, self._parse_sum())
+        return node
+
+    def _parse_sum(self) -> ConditionNode:
+        return self._parse_binary(("+", "-"), self._parse_product)
+
+    def _parse_product(self) -> ConditionNode:
+        return self._parse_binary(("*", "/"), self._parse_unary)
+
+    def _parse_unary(self) -> ConditionNode:
+        if self._peek() == "-":
+            self._next()
+            return ("operator", "-", ("value", 0.0), self._parse_unary())
+        return self._parse_atom()
+
+    def _parse_atom(self) -> ConditionNode:
+        token = self._next()
+
+        if token == "(":
+            node = self._parse_or()
+            if self._next() != ")":
+                raise ValueError(
+                    f"Invalid condition: {self._condition} (expected ')')"
+                )
+            return node
 
-    def convert(self, value: str) -> Any:
-        """Convert a value to a Python object."""
+        if re.fullmatch(r"\d+(\.\d+)?", token):
+            return ("value", float(token))
 
-        if value.isdigit():
-            return int(value)
+        if token.lower() in ("true", "false"):
+            return ("value", token.lower() == "true")
 
-        if value.lower() == "true":
+        if self._is_reference(token):
+            return ("reference", token)
+
+        raise ValueError(
+            f"Invalid condition: {self._condition} "
+            + f"(unknown value '{token}')"
+        )
+
+    @staticmethod
+    def _is_reference(token: str) -> bool:
+        """Returns True if the token names a simulation value, e.g.
+        'character.anima' or 'buff.ice_blitz.remaining_time'."""
+        if token == "active_enemies":
             return True
+        if token.startswith("character."):
+            return token.count(".") >= 1
+        return (
+            token.startswith(SimFileConditionParser.reference_prefixes)
+            and token.count(".") >= 2
+        )
 
-        if value.lower() == "false":
-            return False
-
-        return value
-
-    def parse_expression(self, expression: str) -> Any:
-        """Parse and evaluate a complex expression."""
-
-        # Tokenize the expression
-        tokens = re.split(r"(\s+|\b|\(|\))", expression)
-        stack = []
-
-        for token in tokens:
-            token = token.strip()
-            if not token:
-                continue
-
-            if token.isdigit():
-                stack.append(int(token))
-            elif token in SimFileConditionParser.possible_operators:
-                if token == "not":
-                    operand = stack.pop()
-                    result = SimFileConditionParser.possible_operators[token](
-                        operand
-                    )
-                else:
-                    right = stack.pop()
-                    left = stack.pop()
-                    result = SimFileConditionParser.possible_operators[token](
-                        left, right
-                    )
-                stack.append(result)
-            elif token.lower() in ["true", "false"]:
-                stack.append(token.lower() == "true")
-            elif token == "(":
-                stack.append(token)
-            elif token == ")":
-                # Evaluate the expression within parentheses
-                sub_expr = []
-                while stack and stack[-1] != "(":
-                    sub_expr.append(stack.pop())
-                stack.pop()  # Remove the '(' from the stack
-                sub_expr.reverse()
-                # Evaluate the sub-expression
-                result = self.parse_expression(" ".join(map(str, sub_expr)))
-                stack.append(result)
-            else:
-                # Handle variables or attributes
-                stack.append(self.convert(token))
-
-        return stack[0] if stack else None
-
-    def parse(self) -> Condition:
+    def parse(self) -> ConditionNode:
         """Parse the condition."""
-        for op_key, _ in SimFileConditionParser.possible_operators.items():
-            if op_key in self._condition:
-                left, right = self._condition.split(op_key, 1)
-                return Condition(
-                    left=left.strip(),
-                    operator=op_key,
-                    right=right.strip(),
-                )
+        self._tokens = self._tokenize()
+        self._position = 0
+
+        node = self._parse_or()
+        if self._peek():
+            raise ValueError(
+                f"Invalid condition: {self._condition} "
+                + f"(unexpected '{self._peek()}')"
+            )
 
-        raise ValueError(f"Invalid condition: {self._condition}")
+        return node
+
+    def compile(self, simulation: "Simulation") -> Callable[[], bool]:
+        """Parse the condition into a callable bound to the simulation."""
+        accessor = SimFileConditionParser.compile_node(
+            self.parse(), simulation
+        )
+        return lambda: bool(accessor())
 
     @staticmethod
-    def evaluate_conditions(
-        conditions: List[Condition], simulation: "Simulation"
-    ) -> bool:
-        """Checks all conditions."""
-        checks: List[bool] = []
-
-        for condition in conditions:
-            # Get both values.
-            left_value = SimFileConditionParser.parse_side(
-                condition.left, simulation
-            )
-            right_value = SimFileConditionParser.parse_side(
-                condition.right, simulation
+    def compile_node(
+        node: ConditionNode, simulation: "Simulation"
+    ) -> ConditionAccessor:
+        """Compiles a parsed node into an accessor for its value."""
+        kind = node[0]
+
+        if kind == "value":
+            value = node[1]
+            return lambda: value
+
+        if kind == "reference":
+            return SimFileConditionParser.compile_reference(
+                node[1], simulation
             )
 
-            # Get the Op function.
-            op_func = SimFileConditionParser.possible_operators.get(
-                condition.operator
-            )
-            # if left_value is not None or right_value is not None:
-            if simulation.detailed_debug:
-                print(
-                    f"\t-> Checking if {left_value}"
-                    + f" {condition.operator} {right_value}"
-                )
-            # If everything is set. We evaluate to see if condition is met.
-            if (
-                op_func is not None
-                and left_value is not None
-                and right_value is not None
-            ):
-                checks.append(
-                    op_func(left_value, right_value),
-                )
+        if kind == "not":
+            operand = SimFileConditionParser.compile_node(node[1], simulation)
+            return lambda: not operand()
+
+        symbol = node[1]
+        left = SimFileConditionParser.compile_node(node[2], simulation)
+        right = SimFileConditionParser.compile_node(node[3], simulation)
+
+        if symbol == "and":
+            return lambda: left() and right()
+        if symbol == "or":
+            return lambda: left() or right()
+        if symbol == "xor":
+            return lambda: bool(left()) ^ bool(right())
+
+        op_func = SimFileConditionParser.possible_operators[symbol]
+
+        # Comparisons against values that cannot be resolved, such as a buff
+        # that is not active, are ignored and count as met. Arithmetic
+        # carries the missing value through to the comparison.
+        missing = (
+            True
+            if symbol in SimFileConditionParser.comparison_operators
+            else None
+        )
+
+        if node[3][0] == "value":
+            constant = node[3][1]
 
-        return all(checks)
+            def evaluate_constant():
+                left_value = left()
+                if left_value is None:
+                    return missing
+                return op_func(left_value, constant)
+
+            return evaluate_constant
+
+        def evaluate():
+            left_value = left()
+            right_value = right()
+            if left_value is None or right_value is None:
+                return missing
+            return op_func(left_value, right_value)
+
+        return evaluate
 
     @staticmethod
-    def parse_side(condition: str, simulation: "Simulation") -> Any:
-        """Parses out the side and fetches the appropriate value."""
+    def compile_reference(
+        reference: str, simulation: "Simulation"
+    ) -> ConditionAccessor:
+        """Binds a reference such as 'spell.cold_snap.remaining_cooldown'
+        to the object it reads from."""
 
-        # If the values are floats or ints, just return as is.
-        if bool(re.fullmatch(r"-?\d+(\.\d+)?", condition)):
-            return float(condition)
+        if reference == "active_enemies":
+            return lambda: simulation.enemy_count
 
-        if condition.startswith("active_enemies"):
-            return simulation.enemy_count
+        character = simulation.character
 
-        if condition.startswith("character."):
-            return SimFileConditionParser.get_character_value(
-                condition, simulation
+        if reference.startswith("character."):
+            attribute_name = reference.split(".", 1)[1]
+            return SimFileConditionParser._bind_attribute(
+                character, attribute_name
             )
-        if condition.startswith("spell."):
-            return SimFileConditionParser.get_spell_value(
-                condition, simulation
-            )
-        if condition.startswith("buff."):
-            return SimFileConditionParser.get_buff_value(condition, simulation)
-        if condition.startswith("debuff."):
-            return SimFileConditionParser.get_debuff_value(
-                condition, simulation
+
+        prefix, name, attribute_name = reference.split(".", 2)
+
+        if prefix == "spell":
+            if name not in character.spells:
+                raise ValueError(
+                    f"Unknown spell '{name}' in condition '{reference}'"
+                )
+            return SimFileConditionParser._bind_attribute(
+                character.spells[name], attribute_name
             )
 
-    @staticmethod
-    def get_character_value(condition: str, simulation: "Simulation") -> Any:
-        """Returns the condition value from the Character."""
-        attribute_name = condition.split(".", 1)[1]
-        character_value = getattr(simulation.character, attribute_name, None)
-        if callable(character_value):
-            character_value = character_value()
-        return character_value
+        # Buffs and debuffs come and go, so they are looked up on each check.
+        # The dictionaries themselves live for the whole simulation.
+        auras = character.buffs if prefix == "buff" else simulation.debuffs
 
-    @staticmethod
-    def get_spell_value(condition: str, simulation: "Simulation") -> Any:
-        """Returns the condition value from the Spell."""
-        spell_name = condition.split(".", 2)[1]
-        attribute_name = condition.split(".", 2)[2]
-        spell_value = getattr(
-            simulation.character.spells[spell_name], attribute_name, None
-        )
-        if callable(spell_value):
-            spell_value = spell_value()
-        return spell_value
+        def get_aura_value():
+            aura = auras.get(name)
+            if aura is None:
+                return None
+            value = getattr(aura, attribute_name, None)
+            return value() if callable(value) else value
 
-    @staticmethod
-    def get_buff_value(condition: str, simulation: "Simulation") -> Any:
-        """Returns the condition value from buffs"""
-        buff_name = condition.split(".", 2)[1]
-        attribute_name = condition.split(".", 2)[2]
-        if buff_name in simulation.character.buffs:
-            buff_value = getattr(
-                simulation.character.buffs[buff_name], attribute_name, None
-            )
-            if callable(buff_value):
-                buff_value = buff_value()
-            return buff_value
-        return None
+        return get_aura_value
 
     @staticmethod
-    def get_debuff_value(condition: str, simulation: "Simulation") -> Any:
-        """Returns the condition value from debuffs"""
-        debuff_name = condition.split(".", 2)[1]
-        attribute_name = condition.split(".", 2)[2]
-        if debuff_name in simulation.debuffs:
-            debuff_value = getattr(
-                simulation.debuffs[debuff_name], attribute_name, None
-            )
-            if callable(debuff_value):
-                debuff_value = debuff_value()
-            return debuff_value
-        return None
+    def _bind_attribute(target: Any, attribute_name: str) -> ConditionAccessor:
+        """Returns an accessor for an attribute, calling it if it is
+        a method."""
+        if callable(getattr(target, attribute_name, None)):
+            return getattr(target, attribute_name)
+
+        return lambda: getattr(target, attribute_name, None)
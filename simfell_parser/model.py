@@ -8,29 +8,21 @@ from simfell_parser.enums import Gem, TierSet, Tier
 from simfell_parser.utils import CharacterTypeT, map_character_name_to_class
 
 
-class Condition(BaseModel):
-    """Class for a condition in a SimFell file."""
-
-    left: str
-    operator: str
-    right: Any
-
-    def __str__(self):
-        return (
-            f"[cornflower_blue]{self.left}[/cornflower_blue] "
-            + f"[grey37]{self.operator}[/grey37] "
-            + f"[cyan]{self.right}[/cyan]"
-        )
-
-
 class Action(BaseModel):
     """Class for an action in a SimFell file."""
 
     name: str
-    conditions: List[Condition]
+    condition: Optional[str] = None
+
+    @property
+    def spell_name(self) -> str:
+        """Returns the SimFell name of the spell the action casts."""
+        return self.name.split("/")[1]
 
     def __str__(self):
-        return f"{self.name} ({', '.join(self.conditions)})"
+        if self.condition:
+            return f"{self.name},if={self.condition}"
+        return self.name
 
 
 class GemTier(BaseModel):
@@ -64,6 +56,15 @@ class Gear(BaseModel):
     shoulder: Optional[Equipment] = None
 
 
+class TopGear(BaseModel):
+    """Class for the candidate items of each gear slot, and the candidate
+    gems of socketed items, compared by top gear."""
+
+    helmet: List[Equipment] = []
+    shoulder: List[Equipment] = []
+    gems: List[GemTier] = []
+
+
 class SimFellConfiguration(BaseModel):
     """Class for a SimFell configuration."""
 
@@ -81,9 +82,18 @@ class SimFellConfiguration(BaseModel):
     duration: int
     enemies: int
     run_count: int
+    # Stop once the standard error of the mean DPS falls below this. The
+    # run count is then the most iterations that will be run.
+    target_error: Optional[float] = None
+    # Width in seconds of the DPS timeline buckets. No timeline if unset.
+    timeline_bucket: Optional[float] = None
+    # File the last events before an iteration fails are written to. The
+    # events are only kept if set.
+    event_log_file: Optional[str] = None
 
     actions: List[Action]
     gear: Gear
+    top_gear: TopGear = TopGear()
 
     _character: Optional[CharacterTypeT] = None
 
@@ -93,19 +103,50 @@ class SimFellConfiguration(BaseModel):
 
         return self.model_dump_json(indent=2)
 
+    @property
+    def talent_identifiers(self) -> List[str]:
+        """Return the talent identifiers of the talent string.
+        e.g. "2-12-3" means Talent 1.2, 2.1, 2.2, 3.3"""
+
+        if not self.talents:
+            return []
+
+        return [
+            f"{row + 1}.{column}"
+            for row, columns in enumerate(self.talents.split("-"))
+            for column in columns
+        ]
+
+    def build_character(self) -> BaseCharacter:
+        """Build a new character from the stats and talents."""
+
+        character_class = map_character_name_to_class(self.hero)
+        character = character_class(
+            intellect=self.intellect,
+            crit=self.crit,
+            expertise=self.expertise,
+            haste=self.haste,
+            spirit=self.spirit,
+        )
+        for talent_identifier in self.talent_identifiers:
+            character.add_talent(talent_identifier)
+
+        return character
+
+    def with_changes(self, **changes: Any) -> "SimFellConfiguration":
+        """Return a copy of the configuration with the given fields
+        changed and its character rebuilt."""
+
+        configuration = self.model_copy(update=changes)
+        configuration.character = configuration.build_character()
+        return configuration
+
     @property
     def character(self) -> BaseCharacter:
         """Return the character for the configuration."""
 
         if self._character is None:
-            character_class = map_character_name_to_class(self.hero)
-            self._character = character_class(
-                intellect=self.intellect,
-                crit=self.crit,
-                expertise=self.expertise,
-                haste=self.haste,
-                spirit=self.spirit,
-            )
+            self._character = self.build_character()
 
         return self._character
 
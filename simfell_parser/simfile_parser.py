@@ -1,7 +1,7 @@
 """Module for parsing SimFell files."""
 
 import re
-from typing import List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from simfell_parser.model import (
     Action,
@@ -11,6 +11,13 @@ from simfell_parser.model import (
 )
 from simfell_parser.enums import Gem, TierSet, Tier
 from simfell_parser.condition_parser import SimFileConditionParser
+from simfell_parser.action_list import ActionListCompiler
+
+# A profileset line, e.g. profileset."more haste"+=haste=200. The rest of the
+# line is any SimFell line, applied on top of the baseline configuration.
+PROFILESET_PATTERN = re.compile(
+    r'^profileset\."(?P<name>[^"]+)"\+=(?P<line>.+)$'
+)
 
 
 class SimFileParser:
@@ -26,10 +33,8 @@ class SimFileParser:
             return line[: line.index("#")]
         return line
 
-    def parse(self) -> SimFellConfiguration:
-        """Parse the SimFell file."""
-
-        data = {"actions": [], "gear": {}}
+    def _lines(self) -> Iterator[str]:
+        """Yield the lines of the SimFell file without comments."""
 
         with open(self._file_path, "r", encoding="utf-8") as file:
             for line in file:
@@ -37,18 +42,114 @@ class SimFileParser:
                 if not line or line.startswith("#"):
                     continue
 
-                line = self._handle_comments(line)
+                yield self._handle_comments(line)
+
+    def _add_value(self, data: Dict[str, Any], key: str, value: Any) -> None:
+        """Add a parsed line to the configuration data."""
+
+        if key.startswith("action") or key.startswith("actions"):
+            data["actions"].extend(value)
+        elif key.startswith("gear_"):
+            data["gear"][key.split("_")[1]] = value
+        elif key.startswith("topgear_"):
+            data["top_gear"].setdefault(key.split("_")[1], []).extend(value)
+        else:
+            data[key] = value
+
+    def parse(self) -> SimFellConfiguration:
+        """Parse the SimFell file, without its profilesets."""
+
+        data = {"actions": [], "gear": {}, "top_gear": {}}
+
+        for line in self._lines():
+            if PROFILESET_PATTERN.match(line):
+                continue
+
+            key, value = self._parse_line(line)
+            self._add_value(data, key, value)
+
+        configuration = SimFellConfiguration(**data)
+        ActionListCompiler.validate(
+            configuration.actions, configuration.character
+        )
 
-                key, value = self._parse_line(line)
+        return configuration
 
-                if key.startswith("action") or key.startswith("actions"):
-                    data["actions"].extend(value)
-                elif key.startswith("gear_"):
-                    data["gear"][key.split("_")[1]] = value
-                else:
-                    data[key] = value
+    def count_profilesets(self) -> int:
+        """Count the profilesets of the SimFell file, without parsing them."""
 
-        return SimFellConfiguration(**data)
+        names = set()
+        for line in self._lines():
+            match = PROFILESET_PATTERN.match(line)
+            if match:
+                names.add(match.group("name"))
+
+        return len(names)
+
+    def profilesets(
+        self, baseline: SimFellConfiguration
+    ) -> Iterator[Tuple[str, SimFellConfiguration]]:
+        """
+        Yield the name and configuration of each profileset, parsed one at
+        a time so files with many profilesets stay light on memory.
+
+        Each profileset is the baseline with its lines applied, and its
+        lines must be consecutive. An action= line replaces the baseline's
+        actions, while actions+= lines add to them.
+        """
+
+        baseline_data = baseline.model_dump()
+        seen = set()
+        name: Optional[str] = None
+        lines: List[Tuple[str, Any]] = []
+
+        for line in self._lines():
+            match = PROFILESET_PATTERN.match(line)
+            if not match:
+                continue
+
+            if match.group("name") != name:
+                if name is not None:
+                    yield name, self._parse_profileset(baseline_data, lines)
+
+                name = match.group("name")
+                if name in seen:
+                    raise ValueError(
+                        f"Profileset '{name}' must be on consecutive lines."
+                    )
+                seen.add(name)
+                lines = []
+
+            lines.append(self._parse_line(match.group("line")))
+
+        if name is not None:
+            yield name, self._parse_profileset(baseline_data, lines)
+
+    def _parse_profileset(
+        self, baseline_data: Dict[str, Any], lines: List[Tuple[str, Any]]
+    ) -> SimFellConfiguration:
+        """Apply the parsed lines of a profileset to the baseline data."""
+
+        data = {
+            **baseline_data,
+            "actions": list(baseline_data["actions"]),
+            "gear": dict(baseline_data["gear"]),
+            "top_gear": {
+                key: list(value)
+                for key, value in baseline_data["top_gear"].items()
+            },
+        }
+        for key, value in lines:
+            if key == "action":
+                data["actions"] = []
+            self._add_value(data, key, value)
+
+        configuration = SimFellConfiguration(**data)
+        ActionListCompiler.validate(
+            configuration.actions, configuration.character
+        )
+
+        return configuration
 
     def _parse_list_like_line(self, list_line: str) -> List[Action]:
         """
@@ -61,16 +162,14 @@ class SimFileParser:
 
         for match in re.finditer(pattern, list_line):
             name = match.group("name").strip()
-            conditions_str = match.group("conditions")
-            conditions = []
+            condition = match.group("conditions")
 
-            if conditions_str:
-                conditions = [
-                    SimFileConditionParser(cond.strip()).parse()
-                    for cond in conditions_str.split(" and ")
-                ]
+            if condition:
+                condition = condition.strip()
+                # Parsed here only to report invalid conditions early.
+                SimFileConditionParser(condition).parse()
 
-            actions.append(Action(name=name, conditions=conditions))
+            actions.append(Action(name=name, condition=condition or None))
 
         return actions
 
@@ -118,22 +217,23 @@ class SimFileParser:
                 haste=haste,
                 spirit=spirit,
                 gem_bonus=gem_bonus,
-                gem=(
-                    GemTier(
-                        tier=Tier[gem.split("_")[1].upper()],
-                        gem=Gem(gem.split("_")[0]),
-                    )
-                    if gem
-                    else None
-                ),
+                gem=self._parse_gem(gem) if gem else None,
                 ilvl=ilvl,
                 tier=Tier(tier),
                 tier_set=TierSet(tier_set) if tier_set else None,
             )
 
+    def _parse_gem(self, gem: str) -> GemTier:
+        """Parse a gem of the SimFell file, e.g. emerald_t1."""
+
+        return GemTier(
+            tier=Tier[gem.split("_")[1].upper()],
+            gem=Gem(gem.split("_")[0]),
+        )
+
     def _parse_line(self, line: str) -> Tuple[
         str,
-        str | List[Action] | Equipment,
+        str | List[Action] | Equipment | List[Equipment] | List[GemTier],
     ]:
         """Parse a line of the SimFell file."""
 
@@ -147,5 +247,10 @@ class SimFileParser:
         # Handle values for gear
         if key.startswith("gear_"):
             return key, self._parse_gear_line(value)
+        # Handle candidate gems and items for top gear
+        if key == "topgear_gems":
+            return key, [self._parse_gem(gem) for gem in value.split(",")]
+        if key.startswith("topgear_"):
+            return key, [self._parse_gear_line(value)]
 
         return key, value
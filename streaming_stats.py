@@ -0,0 +1,184 @@
+"""Module for constant memory statistics over streams of values."""
+
+import math
+from typing import Dict, Tuple
+
+import numpy as np
+
+# Percentiles shown for DPS distributions.
+REPORTED_QUANTILES = (0.01, 0.05, 0.5, 0.95, 0.99)
+
+# z-score of a two sided 95% confidence interval.
+CONFIDENCE_Z = 1.96
+
+
+class QuantileSketch:
+    """Class for a mergeable quantile sketch with relative accuracy.
+
+    Values are counted in logarithmic buckets, each covering a range of
+    values within the relative accuracy of its midpoint. The number of
+    buckets only grows with the spread of the values, never with how many
+    there are, and sketches merge by adding bucket counts.
+    """
+
+    __slots__ = ("relative_accuracy", "_gamma", "_log_gamma", "_buckets")
+
+    def __init__(self, relative_accuracy: float = 0.001):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        # Bucket index to count. Zero and negative values share bucket
+        # None, as DPS never goes below zero.
+        self._buckets: Dict[int, int] = {}
+
+    @property
+    def count(self) -> int:
+        """Returns the number of values added."""
+        return sum(self._buckets.values())
+
+    def add(self, value: float) -> None:
+        """Adds a value to the sketch."""
+        key = (
+            math.ceil(math.log(value) / self._log_gamma) if value > 0 else None
+        )
+        self._buckets[key] = self._buckets.get(key, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Merges another sketch with the same accuracy into this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches of different accuracy.")
+
+        for key, count in other._buckets.items():
+            self._buckets[key] = self._buckets.get(key, 0) + count
+
+    def _bucket_value(self, key) -> float:
+        """Returns the value representing a bucket."""
+        if key is None:
+            return 0.0
+        return 2 * self._gamma**key / (self._gamma + 1)
+
+    def quantile(self, quantile: float) -> float:
+        """Returns the estimated value at the quantile, between 0 and 1."""
+        count = self.count
+        if not count:
+            return math.nan
+
+        rank = quantile * (count - 1)
+        keys = sorted(
+            self._buckets,
+            key=lambda key: float("-inf") if key is None else key,
+        )
+
+        seen = 0
+        for key in keys:
+            seen += self._buckets[key]
+            if seen > rank:
+                return self._bucket_value(key)
+
+        return self._bucket_value(keys[-1])
+
+
+class MeanVariance:
+    """Class for the running mean and variance of a stream of values, using
+    Welford's update. Values may also be NumPy arrays of a fixed shape, in
+    which case every element is tracked separately. Accumulators from
+    separate chunks or worker processes merge into the statistics of all
+    their values."""
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    @classmethod
+    def of_zeros(cls, count: int) -> "MeanVariance":
+        """Returns the statistics of the given number of zeros."""
+        statistics = cls()
+        statistics.count = count
+        return statistics
+
+    def add(self, value: float) -> None:
+        """Adds a value."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other: "MeanVariance") -> None:
+        """Merges the statistics of another stream into this one."""
+        if not other.count:
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta**2 * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self) -> float:
+        """Returns the sample variance."""
+        return self._m2 / max(self.count - 1, 1)
+
+    @property
+    def standard_deviation(self) -> float:
+        """Returns the sample standard deviation."""
+        return np.sqrt(self.variance)
+
+    @property
+    def standard_error(self) -> float:
+        """Returns the standard error of the mean."""
+        if self.count < 2:
+            return float("inf")
+        return np.sqrt(self.variance / self.count)
+
+    def confidence_interval(self) -> Tuple[float, float]:
+        """Returns the 95% confidence interval of the mean."""
+        margin = CONFIDENCE_Z * self.standard_error
+        return self.mean - margin, self.mean + margin
+
+
+class StreamingStatistics(MeanVariance):
+    """Class for the mean, variance, extremes and quantiles of a stream of
+    values in constant memory."""
+
+    __slots__ = ("minimum", "maximum", "sketch")
+
+    def __init__(self):
+        super().__init__()
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+        self.sketch = QuantileSketch()
+
+    def add(self, value: float) -> None:
+        """Adds a value."""
+        super().add(value)
+
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+        self.sketch.add(value)
+
+    def merge(self, other: "StreamingStatistics") -> None:
+        """Merges the statistics of another stream into this one."""
+        if not other.count:
+            return
+
+        super().merge(other)
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.sketch.merge(other.sketch)
+
+    def quantile(self, quantile: float) -> float:
+        """Returns the estimated value at the quantile, between 0 and 1,
+        clamped to the extremes seen, which the sketch's buckets can
+        overshoot."""
+        if not self.count:
+            return math.nan
+        return min(
+            max(self.sketch.quantile(quantile), self.minimum), self.maximum
+        )
@@ -1,42 +1,31 @@
 """Test the parser."""
 
-from simfell_parser.condition_parser import SimFileConditionParser
 from simfell_parser.simfile_parser import SimFileParser
-from simfell_parser.utils import SpellTypeT
+from sim import Simulation
 
 
 parser = SimFileParser("test.simfell")
 configuration = parser.parse()
 # print(configuration.parsed_json)
 
+# Conditions are compiled against a simulation's character.
+simulation = Simulation(configuration)
 
-print(f"Character Anima: {configuration.character.anima}\n")
+print(f"Character Anima: {simulation.character.anima}\n")
 
 print("Summary of actions and results:")
-for action in configuration.actions:
+for action in simulation.action_list:
     # Action = Spell
     # Imagine like we are looping through character rotation
 
-    print(f"Action: '{action.name}', Conditions: {len(action.conditions)}")
-
-    spell: SpellTypeT = configuration.character.spells.get(
-        action.name.split("/")[1], None
-    )
-    if not spell:
-        print(f"Spell '{action.name}' not found in character spells")
-        continue
-
-    character_result = SimFileConditionParser.evaluate_character(
-        action.conditions, configuration.character
-    )
-    spell_result = SimFileConditionParser.evaluate_spell(
-        action.conditions,
-        configuration.character,
+    print(
+        f"Action: '{action.action.name}', "
+        + f"Conditions: {action.action.condition}"
     )
 
-    is_spell_ready = spell.is_ready()
+    condition_result = action.check_conditions()
+    is_spell_ready = action.spell.is_ready()
 
-    print(f"\tCharacter Result: {character_result}")
-    print(f"\tSpell Result: {spell_result}")
+    print(f"\tCondition Result: {condition_result}")
     print(f"\tSpell Ready: {is_spell_ready}")
     print("\t=====================\n")
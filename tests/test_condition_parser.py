@@ -0,0 +1,94 @@
+"""Tests for compiling SimFell conditions."""
+
+from pathlib import Path
+
+import pytest
+
+from sim import Simulation
+from simfell_parser.condition_parser import SimFileConditionParser
+from simfell_parser.simfile_parser import SimFileParser
+
+SIMFILE = Path(__file__).parent.parent / "test.simfell"
+
+
+@pytest.fixture(scope="module")
+def simulation() -> Simulation:
+    return Simulation(SimFileParser(str(SIMFILE)).parse())
+
+
+def check(condition: str, simulation: Simulation) -> bool:
+    return SimFileConditionParser(condition).compile(simulation)()
+
+
+@pytest.mark.parametrize(
+    "condition, expected",
+    [
+        # and binds tighter than xor, which binds tighter than or.
+        ("true or false and false", True),
+        ("true xor true or true", True),
+        ("false and true xor true", True),
+        ("not false and false", False),
+        ("not (false and false)", True),
+        # Arithmetic binds tighter than comparisons.
+        ("1 + 2 * 3 == 7", True),
+        ("(1 + 2) * 3 == 9", True),
+        ("10 - 4 - 3 == 3", True),
+        ("-2 + 5 == 3", True),
+        ("1 + 1 > 1 and 2 < 3", True),
+    ],
+)
+def test_precedence(condition: str, expected: bool, simulation: Simulation):
+    assert check(condition, simulation) is expected
+
+
+def test_parse_tree():
+    assert SimFileConditionParser("1 + 2 * 3 > 4").parse() == (
+        "operator",
+        ">",
+        (
+            "operator",
+            "+",
+            ("value", 1.0),
+            ("operator", "*", ("value", 2.0), ("value", 3.0)),
+        ),
+        ("value", 4.0),
+    )
+
+
+@pytest.mark.parametrize(
+    "condition, expected",
+    [
+        ("buff.missing.stacks > 3", True),
+        ("buff.missing.stacks == 0", True),
+        ("debuff.missing.remaining_time < 1", True),
+        ("buff.missing.stacks + 1 > 5", True),
+        ("2 * buff.missing.stacks <= 1", True),
+        ("not buff.missing.stacks > 3", False),
+        ("buff.missing.stacks > 3 and 1 > 2", False),
+    ],
+)
+def test_missing_values_count_as_met(
+    condition: str, expected: bool, simulation: Simulation
+):
+    assert check(condition, simulation) is expected
+
+
+def test_references_read_the_simulation(simulation: Simulation):
+    enemies = simulation.enemy_count
+    assert check(f"active_enemies == {enemies}", simulation)
+    assert not check(f"active_enemies > {enemies}", simulation)
+
+
+@pytest.mark.parametrize(
+    "condition", ["1 >", "(1 > 2", "1 > 2)", "foo > 1", "1 $ 2"]
+)
+def test_invalid_conditions(condition: str):
+    with pytest.raises(ValueError):
+        SimFileConditionParser(condition).parse()
+
+
+def test_unknown_spell(simulation: Simulation):
+    with pytest.raises(ValueError):
+        SimFileConditionParser("spell.missing.remaining_cooldown > 1").compile(
+            simulation
+        )
@@ -0,0 +1,70 @@
+"""Tests for keeping the event log on during normal runs."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from event_log import CastEvent, EventLog
+from sim import RECENT_EVENTS_SECONDS, Simulation
+from simfell_parser.simfile_parser import SimFileParser
+
+SIMFILE = Path(__file__).parent.parent / "test.simfell"
+
+
+class ListSink:
+    def __init__(self):
+        self.events = []
+
+    def write(self, event):
+        self.events.append(event)
+
+
+def test_since_and_dump():
+    event_log = EventLog(capacity=3)
+    for time in range(5):
+        event_log.record(CastEvent(float(time), "Frost Bolt"))
+
+    # Only the most recent events are kept.
+    assert [event.time for event in event_log.since(3)] == [3, 4]
+
+    sink = ListSink()
+    event_log.dump(sink)
+    assert [event.time for event in sink.events] == [2, 3, 4]
+
+
+def test_failed_run_writes_recent_events(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    path = tmp_path / "failure.jsonl"
+    configuration = SimFileParser(str(SIMFILE)).parse()
+    configuration.event_log_file = str(path)
+    simulation = Simulation(configuration)
+
+    def failing(cast):
+        def cast_or_fail(spell, *args, **kwargs):
+            if simulation.time > 3:
+                raise RuntimeError("Bad iteration")
+            cast(spell, *args, **kwargs)
+
+        return cast_or_fail
+
+    for spell_class in {
+        type(action.spell) for action in simulation.action_list
+    }:
+        monkeypatch.setattr(spell_class, "cast", failing(spell_class.cast))
+    with pytest.raises(RuntimeError):
+        simulation.run()
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert events
+    assert all(
+        event["time"] >= simulation.time - RECENT_EVENTS_SECONDS
+        for event in events
+    )
+    assert {"cast", "gcd"} <= {event["kind"] for event in events}
+
+
+def test_no_event_log_without_file():
+    configuration = SimFileParser(str(SIMFILE)).parse()
+    assert Simulation(configuration).event_log is None
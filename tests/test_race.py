@@ -0,0 +1,67 @@
+"""Tests for racing configurations by successive halving."""
+
+from pathlib import Path
+
+import pytest
+
+from runner import race_first_round, run_common_random_numbers, run_race
+from simfell_parser.simfile_parser import SimFileParser
+
+SIMFILE = Path(__file__).parent.parent / "test.simfell"
+
+ITERATIONS = 200
+FIRST_ROUND = race_first_round(ITERATIONS)
+
+
+@pytest.fixture(scope="module")
+def configurations():
+    parser = SimFileParser(str(SIMFILE))
+    baseline = parser.parse().with_changes(duration=20)
+    profilesets = dict(parser.profilesets(baseline))
+    return {
+        "Baseline": baseline,
+        "More Haste": profilesets["More Haste"],
+        # Only casting Frost Bolt is far behind the others.
+        "Bolt Only": profilesets["Bolt Only"],
+    }
+
+
+def test_worse_candidate_dropped_within_budget(configurations):
+    results = run_race(configurations, ITERATIONS, keep=1, seed=11)
+
+    runs = {name: len(dps) for name, dps in results.items()}
+    assert runs["Bolt Only"] == FIRST_ROUND
+    assert max(runs, key=runs.get) != "Bolt Only"
+    assert sum(runs.values()) == ITERATIONS * len(configurations)
+
+
+def test_rounds_share_random_numbers(configurations):
+    results = run_race(configurations, ITERATIONS, keep=1, seed=11)
+    single = run_common_random_numbers(configurations, FIRST_ROUND, seed=11)
+
+    # Every configuration's first round uses the same seeds as running it
+    # on its own.
+    for name, dps in single.items():
+        assert results[name][:FIRST_ROUND].tolist() == dps.tolist()
+
+
+def test_no_race_when_keeping_all(configurations):
+    results = run_race(configurations, 10, keep=len(configurations), seed=11)
+    assert {name: len(dps) for name, dps in results.items()} == {
+        name: 10 for name in configurations
+    }
+
+
+def test_first_round_leaves_a_second():
+    assert race_first_round(1000) == 100
+    assert race_first_round(100) == 20
+    assert race_first_round(10) == 5
+    assert race_first_round(1) == 1
+
+
+def test_small_run_counts_still_drop(configurations):
+    results = run_race(configurations, 40, keep=1, seed=3)
+
+    runs = {name: len(dps) for name, dps in results.items()}
+    assert runs["Bolt Only"] == race_first_round(40)
+    assert sum(runs.values()) == 40 * len(configurations)
@@ -0,0 +1,55 @@
+"""Tests for the per-category random number streams."""
+
+import numpy as np
+
+from base.random_streams import BLOCK_SIZE, SimulationRandom
+
+CATEGORIES = ("crit", "spirit", "avalanche")
+
+
+def draws(random: SimulationRandom, category: str, count: int = 50):
+    return [random.roll(category) for _ in range(count)]
+
+
+def test_same_seed_same_rolls():
+    first, second = SimulationRandom(1234), SimulationRandom(1234)
+    for category in CATEGORIES:
+        assert draws(first, category) == draws(second, category)
+
+
+def test_different_seeds_differ():
+    first, second = SimulationRandom(1), SimulationRandom(2)
+    for category in CATEGORIES:
+        assert draws(first, category) != draws(second, category)
+
+
+def test_categories_are_independent():
+    reference = SimulationRandom(99)
+    expected = {
+        category: draws(reference, category) for category in CATEGORIES
+    }
+
+    # Interleaving categories, or rolling one far more than another, never
+    # shifts the rolls another category sees.
+    random = SimulationRandom(99)
+    assert draws(random, "crit", 3 * BLOCK_SIZE)[:50] == expected["crit"]
+    for category in reversed(CATEGORIES[1:]):
+        assert draws(random, category) == expected[category]
+
+    assert expected["crit"] != expected["spirit"]
+
+
+def test_reseed_restarts_streams():
+    random = SimulationRandom(7)
+    expected = draws(random, "crit")
+    draws(random, "spirit")
+
+    random.reseed(7)
+    assert draws(random, "crit") == expected
+
+
+def test_rolls_are_percentages():
+    values = np.array(draws(SimulationRandom(3), "crit", 10_000))
+    assert values.min() >= 0
+    assert values.max() < 100
+    assert abs(values.mean() - 50) < 2
@@ -0,0 +1,104 @@
+"""Tests for the constant memory statistics."""
+
+import math
+
+import numpy as np
+import pytest
+
+from streaming_stats import (
+    MeanVariance,
+    QuantileSketch,
+    StreamingStatistics,
+)
+
+
+@pytest.fixture
+def values() -> np.ndarray:
+    return np.random.default_rng(42).normal(1500, 200, 2000)
+
+
+def test_merge_equals_single_pass(values: np.ndarray):
+    single = StreamingStatistics()
+    for value in values:
+        single.add(value)
+
+    merged = StreamingStatistics()
+    for chunk in np.array_split(values, 7):
+        part = StreamingStatistics()
+        for value in chunk:
+            part.add(value)
+        merged.merge(part)
+    merged.merge(StreamingStatistics())
+
+    assert merged.count == single.count == len(values)
+    assert merged.mean == pytest.approx(single.mean)
+    assert merged.variance == pytest.approx(single.variance)
+    assert merged.minimum == single.minimum
+    assert merged.maximum == single.maximum
+    for quantile in (0.01, 0.5, 0.99):
+        assert merged.quantile(quantile) == single.quantile(quantile)
+
+
+def test_matches_numpy(values: np.ndarray):
+    statistics = MeanVariance()
+    for value in values:
+        statistics.add(value)
+
+    assert statistics.mean == pytest.approx(values.mean())
+    assert statistics.variance == pytest.approx(values.var(ddof=1))
+    assert statistics.standard_error == pytest.approx(
+        values.std(ddof=1) / math.sqrt(len(values))
+    )
+
+
+def test_array_values_merge(values: np.ndarray):
+    rows = values.reshape(-1, 4)
+    first, second = MeanVariance(), MeanVariance()
+    for row in rows[:100]:
+        first.add(row)
+    for row in rows[100:]:
+        second.add(row)
+    first.merge(second)
+
+    np.testing.assert_allclose(first.mean, rows.mean(axis=0))
+    np.testing.assert_allclose(first.variance, rows.var(axis=0, ddof=1))
+
+
+def test_quantiles_within_relative_accuracy(values: np.ndarray):
+    statistics = StreamingStatistics()
+    for value in values:
+        statistics.add(value)
+
+    for quantile in (0.01, 0.05, 0.5, 0.95, 0.99):
+        expected = np.quantile(values, quantile, method="lower")
+        assert statistics.quantile(quantile) == pytest.approx(
+            expected, rel=2 * statistics.sketch.relative_accuracy
+        )
+
+
+@pytest.mark.parametrize("added", [[1234.5678], [1000.0, 1000.5, 1001.0]])
+def test_quantiles_within_extremes(added):
+    statistics = StreamingStatistics()
+    for value in added:
+        statistics.add(value)
+
+    for quantile in (0, 0.01, 0.5, 0.99, 1):
+        assert min(added) <= statistics.quantile(quantile) <= max(added)
+
+
+def test_single_value_has_no_error():
+    statistics = StreamingStatistics()
+    statistics.add(1000.0)
+
+    assert statistics.standard_error == float("inf")
+    assert statistics.quantile(0.5) == 1000.0
+
+
+def test_empty():
+    assert math.isnan(StreamingStatistics().quantile(0.5))
+    assert math.isnan(QuantileSketch().quantile(0.5))
+
+
+def test_sketches_of_different_accuracy_do_not_merge():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.001).merge(QuantileSketch(0.01))
@@ -0,0 +1,28 @@
+"""Tests for the DPS and aura uptime timeline."""
+
+import pytest
+
+from timeline import Timeline, TimelineResult
+
+
+def test_partial_last_bucket():
+    timeline = Timeline(10, 4)
+    timeline.add_damage(9.5, 100)
+    timeline.aura_started("Buff", 7)
+    timeline.finish(10)
+
+    result = TimelineResult(timeline.duration, timeline.bucket_width)
+    result.add(timeline)
+
+    assert result.bucket_spans.tolist() == [4, 4, 2]
+    assert result.dps.mean.tolist() == [0, 0, 50]
+    assert result.uptime("Buff").tolist() == pytest.approx([0, 0.25, 1])
+
+
+def test_damage_after_the_fight_ignored():
+    timeline = Timeline(10, 5)
+    timeline.add_damage(10, 100)
+    timeline.add_damage(12, 100)
+    timeline.add_damage(9.99, 10)
+
+    assert timeline.damage == [0, 10]
@@ -0,0 +1,95 @@
+"""Tests for finding the best combination of candidate gear."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from simfell_parser.model import TopGear
+from simfell_parser.simfile_parser import SimFileParser
+from top_gear import (
+    gem_choices,
+    non_dominated,
+    slot_candidates,
+    top_gear_profilesets,
+)
+
+SIMFILE = Path(__file__).parent.parent / "test.simfell"
+
+
+@pytest.fixture(scope="module")
+def configuration():
+    return SimFileParser(str(SIMFILE)).parse()
+
+
+@pytest.fixture(scope="module")
+def gems(configuration):
+    return configuration.top_gear.gems
+
+
+def test_non_dominated():
+    values = np.array([[1, 1], [2, 2], [2, 1], [0, 3], [1, 3]])
+    assert non_dominated(values).tolist() == [False, True, False, False, True]
+
+
+def test_non_dominated_keeps_first_of_identical_rows():
+    values = np.array([[1, 2], [2, 1], [1, 2], [2, 1]])
+    assert non_dominated(values).tolist() == [True, True, False, False]
+
+
+def test_pruning_only_within_bonus_groups(configuration):
+    combinations, profilesets, _ = top_gear_profilesets(configuration)
+    names = [name for name, _ in profilesets]
+
+    # Four helmet candidates, Helm A with each gem, by three shoulders.
+    assert combinations == 12
+    # Shoulder B has less of every stat than Shoulder C, neither has a set
+    # piece, so it never survives.
+    assert not any("Shoulder B" in name for name in names)
+    # Shoulder C has more intellect than Shoulder A and as much of every
+    # secondary, but Shoulder A is a tier set piece.
+    assert "Helm B + Shoulder A" in names
+    assert "Helm B + Shoulder C" in names
+
+
+def test_identical_stats_simulated_once(configuration):
+    _, profilesets, ties = top_gear_profilesets(configuration)
+    names = [name for name, _ in profilesets]
+
+    # Gem bonuses are not simulated, so Helm A's gems simulate the same.
+    assert "Helm A (ruby t2) + Shoulder C" not in names
+    assert ties["Helm A (emerald t1) + Shoulder C"] == [
+        "Helm A (ruby t2) + Shoulder C"
+    ]
+    assert ties["Helm B + Shoulder C"] == []
+    assert sorted(ties) == sorted(names)
+
+
+def test_stats_swap_in_items(configuration):
+    _, profilesets, _ = top_gear_profilesets(configuration)
+    gear = dict(profilesets)["Helm B + Shoulder A"]
+
+    # The file has no equipped gear, so its stats only gain the items'.
+    assert gear.intellect == configuration.intellect + 16 + 12
+    assert gear.haste == configuration.haste + 20 + 6
+    assert gear.crit == configuration.crit + 13
+    assert gear.gear.helmet.name == "Helm B"
+    assert gear.gear.shoulder.name == "Shoulder A"
+
+
+def test_no_candidates(configuration):
+    empty = configuration.with_changes(top_gear=TopGear())
+    assert top_gear_profilesets(empty) == (0, [], {})
+
+
+def test_gems_expanded_after_pruning(configuration, gems):
+    helmets = dict(slot_candidates(configuration))["helmet"]
+
+    # Helm A is socketed, but only its first gem choice is a candidate.
+    assert [item.name for item in helmets] == ["Helm A", "Helm B", "Helm C"]
+    assert helmets[0].gem == gems[0]
+    assert [gem.gem.value for gem in gem_choices(helmets[0], gems)] == [
+        "emerald",
+        "ruby",
+    ]
+    assert gem_choices(helmets[1], gems) == []
@@ -0,0 +1,123 @@
+"""Module for the DPS and aura uptime timeline."""
+
+import math
+from typing import Dict, List
+
+import numpy as np
+
+from streaming_stats import MeanVariance
+
+
+class Timeline:
+    """Class for the damage and aura uptime of a single simulation, in
+    fixed-width time buckets allocated once for the whole fight."""
+
+    def __init__(self, duration: float, bucket_width: float):
+        if bucket_width <= 0:
+            raise ValueError("Timeline bucket width must be positive.")
+
+        self.duration = duration
+        self.bucket_width = bucket_width
+        self.bucket_count = max(math.ceil(duration / bucket_width), 1)
+        self.damage: List[float] = [0.0] * self.bucket_count
+        self.uptime: Dict[str, List[float]] = {}
+        self._aura_starts: Dict[str, float] = {}
+
+    def clear(self) -> None:
+        """Zeroes every bucket for the next run."""
+        self.damage[:] = [0.0] * self.bucket_count
+        for uptime in self.uptime.values():
+            uptime[:] = [0.0] * self.bucket_count
+        self._aura_starts.clear()
+
+    def bucket(self, time: float) -> int:
+        """Returns the bucket of a time within the fight."""
+        return min(int(time / self.bucket_width), self.bucket_count - 1)
+
+    def add_damage(self, time: float, damage: float) -> None:
+        """Adds damage dealt at the given time, unless it is after the end
+        of the fight."""
+        if time < self.duration:
+            self.damage[self.bucket(time)] += damage
+
+    def aura_started(self, name: str, time: float) -> None:
+        """Starts the uptime of an aura, unless it is already up."""
+        self._aura_starts.setdefault(name, time)
+
+    def aura_ended(self, name: str, time: float) -> None:
+        """Ends the uptime of an aura and adds it to the buckets."""
+        start = self._aura_starts.pop(name, None)
+        if start is None:
+            return
+
+        uptime = self.uptime.get(name)
+        if uptime is None:
+            uptime = self.uptime[name] = [0.0] * self.bucket_count
+
+        end = min(time, self.duration)
+        for bucket in range(self.bucket(start), self.bucket(end) + 1):
+            bucket_start = bucket * self.bucket_width
+            overlap = min(end, bucket_start + self.bucket_width) - max(
+                start, bucket_start
+            )
+            if overlap > 0:
+                uptime[bucket] += overlap
+
+    def finish(self, time: float) -> None:
+        """Ends the uptime of every aura still up at the end of the run."""
+        for name in list(self._aura_starts):
+            self.aura_ended(name, time)
+
+
+class TimelineResult:
+    """Class for the mean DPS and aura uptime per bucket over many
+    iterations. Memory only depends on the number of buckets."""
+
+    def __init__(self, duration: float, bucket_width: float):
+        self.duration = duration
+        self.bucket_width = bucket_width
+        self.bucket_count = max(math.ceil(duration / bucket_width), 1)
+        # Seconds each bucket covers. The last one is cut short when the
+        # duration is not a multiple of the width.
+        starts = np.arange(self.bucket_count) * bucket_width
+        self.bucket_spans = np.minimum(bucket_width, duration - starts)
+        self.iterations = 0
+        self.dps = MeanVariance()
+        # Uptime fraction per bucket, over the iterations the aura was up
+        # in. uptime() accounts for the others.
+        self._uptime: Dict[str, MeanVariance] = {}
+
+    def add(self, timeline: Timeline) -> None:
+        """Adds the timeline of a finished simulation."""
+        self.iterations += 1
+        spans = self.bucket_spans
+        self.dps.add(np.array(timeline.damage) / spans)
+
+        for name, uptime in timeline.uptime.items():
+            if not any(uptime):
+                continue
+            if name not in self._uptime:
+                self._uptime[name] = MeanVariance()
+            self._uptime[name].add(np.array(uptime) / spans)
+
+    def merge(self, other: "TimelineResult") -> None:
+        """Merges the results of another timeline into this one."""
+        self.iterations += other.iterations
+        self.dps.merge(other.dps)
+
+        for name, uptime in other._uptime.items():
+            if name not in self._uptime:
+                self._uptime[name] = MeanVariance()
+            self._uptime[name].merge(uptime)
+
+    @property
+    def auras(self) -> List[str]:
+        """Returns the names of the auras seen, sorted."""
+        return sorted(self._uptime)
+
+    def uptime(self, name: str) -> np.ndarray:
+        """Returns the mean uptime fraction of the aura per bucket."""
+        uptime = MeanVariance()
+        uptime.merge(self._uptime[name])
+        uptime.merge(MeanVariance.of_zeros(self.iterations - uptime.count))
+        return uptime.mean
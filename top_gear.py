@@ -0,0 +1,235 @@
+"""Module for finding the best combination of candidate gear.
+
+Every combination of the candidate items is totalled at once as arrays, and
+combinations another one beats on every stat are pruned before any is
+simulated. Gems add no stat points, so each socketed item's gem choices are
+only expanded for the combinations left.
+"""
+
+import math
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from base.diminishing_returns import points_to_percent
+from simfell_parser.model import Equipment, GemTier, Gear, SimFellConfiguration
+
+# Stats of the configuration that gear adds points to, in column order.
+STATS = ("intellect", "crit", "expertise", "haste", "spirit")
+
+
+def _stat_points(item: Optional[Equipment]) -> np.ndarray:
+    """Returns the points the item adds to each stat."""
+    if item is None:
+        return np.zeros(len(STATS))
+    return np.array([getattr(item, stat) or 0 for stat in STATS], dtype=float)
+
+
+def _gem_name(gem: GemTier) -> str:
+    """Returns the gem as written in SimFell files."""
+    return f"{gem.gem.value}_t{gem.tier.value}"
+
+
+def gem_choices(item: Equipment, gems: List[GemTier]) -> List[GemTier]:
+    """Returns the gems a socketed item can hold, its own first, or none if
+    it has no socket or there is no gem to put in it."""
+    socketed = item.gem is not None or item.gem_bonus is not None
+    if not socketed:
+        return []
+    choices = [item.gem] if item.gem is not None else []
+    return choices + [gem for gem in gems if gem not in choices]
+
+
+def _bonuses(item: Equipment, gems: List[GemTier]) -> List[str]:
+    """Returns the gem choices and tier set of the item, whose bonuses are
+    not stat points."""
+    bonuses = []
+    choices = gem_choices(item, gems)
+    if choices:
+        bonuses.append("/".join(_gem_name(gem) for gem in choices))
+    if item.tier_set is not None:
+        bonuses.append(item.tier_set.value)
+    return bonuses
+
+
+def _describe(item: Equipment) -> str:
+    """Returns the item's name, with its gem if any."""
+    if item.gem is None:
+        return item.name
+    return f"{item.name} ({item.gem.gem.value} t{item.gem.tier.value})"
+
+
+def slot_candidates(
+    configuration: SimFellConfiguration,
+) -> List[Tuple[str, List[Equipment]]]:
+    """Returns the candidate items of each slot with any, the equipped item
+    first. Socketed items hold their first gem choice."""
+    gems = configuration.top_gear.gems
+    slots = []
+    for slot in Gear.model_fields:
+        equipped = getattr(configuration.gear, slot)
+        items = [equipped] if equipped is not None else []
+        items += getattr(configuration.top_gear, slot)
+
+        candidates = []
+        for item in items:
+            choices = gem_choices(item, gems)
+            if choices and item.gem is None:
+                item = item.model_copy(update={"gem": choices[0]})
+            candidates.append(item)
+
+        if candidates:
+            slots.append((slot, candidates))
+
+    return slots
+
+
+def non_dominated(values: np.ndarray) -> np.ndarray:
+    """Returns which rows no other row matches or beats in every column
+    while beating in at least one. Of identical rows, only the first is
+    kept."""
+    keep = np.ones(len(values), dtype=bool)
+    indices = np.arange(len(values))
+    for index, row in enumerate(values):
+        if not keep[index]:
+            continue
+        at_most = np.all(values <= row, axis=1)
+        below = np.any(values < row, axis=1) | (indices > index)
+        keep &= ~(at_most & below)
+    return keep
+
+
+def _gem_variants(
+    items: Dict[str, Equipment], gems: List[GemTier]
+) -> List[str]:
+    """Returns the names of the combination with every other choice of
+    gems."""
+    choices = [
+        [
+            item.model_copy(update={"gem": gem})
+            for gem in gem_choices(item, gems)
+        ]
+        or [item]
+        for item in items.values()
+    ]
+    return [
+        " + ".join(_describe(item) for item in variant)
+        for variant in list(product(*choices))[1:]
+    ]
+
+
+def top_gear_profilesets(
+    configuration: SimFellConfiguration,
+) -> Tuple[int, List[Tuple[str, SimFellConfiguration]], Dict[str, List[str]]]:
+    """Returns how many combinations of candidate gear and gems there are,
+    the name and configuration of each one to simulate, and the names of the
+    combinations tied with each.
+
+    The configuration's stats include its equipped gear, which each
+    combination swaps for its own items. A combination is pruned if another
+    with the same gem choices and tier set pieces has at least its
+    intellect and its percentage of every secondary stat, and more of one.
+    Gem and tier set bonuses are not stat points, so combinations with
+    different ones are never compared. This assumes more of a stat is never
+    worse.
+
+    The simulation does not model gem and tier set bonuses yet, so the
+    combinations left with the same stat points, and every choice of gems
+    for them, would simulate identically. Only the first of them is
+    simulated, the others being its ties.
+    """
+    slots = slot_candidates(configuration)
+    if not slots:
+        return 0, [], {}
+
+    gems = configuration.top_gear.gems
+    combinations = math.prod(
+        sum(max(len(gem_choices(item, gems)), 1) for item in candidates)
+        for _, candidates in slots
+    )
+
+    # One row per combination, holding the candidate index of each slot.
+    choices = np.stack(
+        np.meshgrid(
+            *(np.arange(len(candidates)) for _, candidates in slots),
+            indexing="ij",
+        ),
+        axis=-1,
+    ).reshape(-1, len(slots))
+
+    points = np.array(
+        [getattr(configuration, stat) for stat in STATS], dtype=float
+    ) - sum(
+        _stat_points(getattr(configuration.gear, slot)) for slot, _ in slots
+    )
+    bonus_names = sorted(
+        {
+            bonus
+            for _, candidates in slots
+            for item in candidates
+            for bonus in _bonuses(item, gems)
+        }
+    )
+    bonuses = np.zeros((len(choices), len(bonus_names)), dtype=int)
+    for column, (_, candidates) in enumerate(slots):
+        item_points = np.array([_stat_points(item) for item in candidates])
+        points = points + item_points[choices[:, column]]
+
+        item_bonuses = np.zeros((len(candidates), len(bonus_names)), dtype=int)
+        for row, item in enumerate(candidates):
+            for bonus in _bonuses(item, gems):
+                item_bonuses[row, bonus_names.index(bonus)] += 1
+        bonuses += item_bonuses[choices[:, column]]
+
+    # Intellect has no diminishing returns.
+    character_class = type(configuration.character)
+    stats = points.copy()
+    for column, stat in enumerate(STATS[1:], start=1):
+        stats[:, column] = points_to_percent(
+            points[:, column], character_class.base_percents[stat]
+        )
+
+    keep = np.zeros(len(choices), dtype=bool)
+    _, groups = np.unique(bonuses, axis=0, return_inverse=True)
+    for group in np.unique(groups):
+        members = np.flatnonzero(groups.ravel() == group)
+        keep[members[non_dominated(stats[members])]] = True
+
+    kept = np.flatnonzero(keep)
+    _, first_tied, tied_with = np.unique(
+        points[kept], axis=0, return_index=True, return_inverse=True
+    )
+
+    profilesets = []
+    ties: Dict[str, List[str]] = {}
+    names = {}
+    for position, index in enumerate(kept):
+        items = {
+            slot: candidates[choice]
+            for (slot, candidates), choice in zip(slots, choices[index])
+        }
+        names[index] = " + ".join(_describe(item) for item in items.values())
+
+        simulated = kept[first_tied[tied_with.ravel()[position]]]
+        if simulated != index:
+            ties[names[simulated]].append(names[index])
+            ties[names[simulated]] += _gem_variants(items, gems)
+            continue
+
+        ties[names[index]] = _gem_variants(items, gems)
+        profilesets.append(
+            (
+                names[index],
+                configuration.with_changes(
+                    gear=configuration.gear.model_copy(update=items),
+                    intellect=round(points[index, 0]),
+                    **{
+                        stat: float(points[index, column])
+                        for column, stat in enumerate(STATS[1:], start=1)
+                    },
+                ),
+            )
+        )
+
+    return combinations, profilesets, ties